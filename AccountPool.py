@@ -0,0 +1,121 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from HttpLogic.Cache import ResponseCache
+from HttpLogic.Instrumentation import Instrumentation
+from HttpLogic.Scheduler import RequestScheduler
+from HttpLogic.Session import ConnectionPool
+from HttpLogic.TokenStore import TokenStore
+from TransIpRestfulAPI import TransIpRestfulAPI
+
+
+class AccountPool:
+    """Clients for many TransIP accounts sharing one connection pool.
+
+    Clients are created on first use. Every request of an account holds a
+    slot of that account, at most account_concurrency, and a slot of the
+    pool, at most max_concurrency, while it is sent. Rate limits stay per
+    account, as the API counts them per account.
+    """
+
+    api_class = TransIpRestfulAPI
+
+    def __init__(
+            self,
+            max_concurrency: int = 20,
+            account_concurrency: int = 4,
+            session: ConnectionPool = None,
+            cache: ResponseCache = None,
+            instrumentation: Instrumentation = None,
+            token_store: TokenStore = None
+    ):
+        """AccountPool init, cache, instrumentation and token_store are shared by all accounts.
+
+        Cached responses are keyed on login and token scope, accounts never
+        read each others entries.
+        """
+        self.max_concurrency = max_concurrency
+        self.account_concurrency = account_concurrency
+        self.session = session if session is not None else ConnectionPool(pool_maxsize=max_concurrency)
+        self.cache = cache
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.token_store = token_store
+        self._limit = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._credentials = {}
+        self._clients = {}
+
+    def add_account(self, login: str, key_url):
+        """Register an account, key_url accepts everything TransIpAuthenticate does."""
+        with self._lock:
+            self._credentials[login] = key_url
+
+    def remove_account(self, login: str):
+        with self._lock:
+            self._credentials.pop(login)
+            client = self._clients.pop(login, None)
+
+        if client is not None:
+            client.auth.close()
+
+    def logins(self) -> list:
+        with self._lock:
+            return list(self._credentials)
+
+    def get(self, login: str) -> TransIpRestfulAPI:
+        """Client of login, created on first use."""
+        with self._lock:
+            client = self._clients.get(login)
+            if client is not None:
+                return client
+
+            if login not in self._credentials:
+                raise KeyError(f'Unknown account: {login}')
+
+            scheduler = RequestScheduler(limits=(threading.BoundedSemaphore(self.account_concurrency), self._limit))
+            client = self.api_class(
+                login,
+                self._credentials[login],
+                self.session,
+                self.cache,
+                self.instrumentation,
+                self.token_store,
+                scheduler
+            )
+            self._clients[login] = client
+            return client
+
+    def run(self, query, logins: list = None, return_exceptions: bool = True) -> dict:
+        """Call query(client) for every account concurrently, return results by login.
+
+        Failing accounts map to their exception unless return_exceptions is
+        false, then the first failure is raised once all queries finished.
+        """
+        logins = self.logins() if logins is None else list(logins)
+        if len(logins) == 0:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(len(logins), self.max_concurrency)) as executor:
+            futures = {login: executor.submit(lambda login=login: query(self.get(login))) for login in logins}
+
+        results = {}
+        for login, future in futures.items():
+            error = future.exception()
+            if error is not None and not return_exceptions:
+                raise error
+
+            results[login] = error if error is not None else future.result()
+
+        return results
+
+    def close(self):
+        """Stop token refreshes of all clients and close the shared connections."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for client in clients:
+            client.auth.close()
+
+        self.session.close()
@@ -0,0 +1,152 @@
+from HttpLogic.AsyncRequestTypes import AsyncApiRequests
+from HttpLogic.Cache import ResponseCache
+from HttpLogic.Session import ConnectionPool
+from HttpLogic.TokenStore import TokenStore
+from TransIpRestfulAPI import TransIpRestfulAPI
+
+from Models import *
+
+
+class AsyncTransIpRestfulAPI:
+    """Awaitable counterpart of TransIpRestfulAPI.
+
+    Thread backed, not asyncio native: every call runs the synchronous
+    client on a pool of concurrency threads, which bounds the requests in
+    flight. limit arguments may lower that bound but not raise it.
+    """
+
+    api_class = TransIpRestfulAPI
+
+    def __init__(
+            self,
+            login: str,
+            key_url: str,
+            session: ConnectionPool = None,
+            cache: ResponseCache = None,
+            concurrency: int = 10,
+            token_store: TokenStore = None
+    ):
+        """Set Api with credentials."""
+        if session is None:
+            session = ConnectionPool(pool_maxsize=concurrency)
+
+        self.api = self.api_class(login, key_url, session, cache, token_store=token_store)
+        self.auth = self.api.auth
+        self.session = self.api.session
+        self.requests = AsyncApiRequests(self.api.requests, concurrency)
+
+    async def gather(self, *awaitables, limit: int = None, return_exceptions: bool = False) -> list:
+        """Await all awaitables, at most limit (up to concurrency) at the same time."""
+        return await self.requests.gather(*awaitables, limit=limit, return_exceptions=return_exceptions)
+
+    def close(self):
+        self.requests.close()
+        self.api.close()
+
+    # ### Get requests ### #
+
+    async def get_availability_zones(self) -> [AvailabilityZone]:
+        return await self.requests.run(self.api.get_availability_zones)
+
+    async def get_branding_for_domain(self, domain: str) -> Branding:
+        return await self.requests.run(self.api.get_branding_for_domain, domain)
+
+    async def get_contacts_for_domain(self, domain: str) -> Contacts:
+        return await self.requests.run(self.api.get_contacts_for_domain, domain)
+
+    async def get_dns_for_domain(self, domain: str) -> DNSes:
+        return await self.requests.run(self.api.get_dns_for_domain, domain)
+
+    async def get_domains(self, tags: list = None, include: list = None) -> [Domain]:
+        include = [] if include is None else list(include)
+        server_side = [name for name in include if name in Domain.server_includes]
+        domains = await self.requests.run(self.api.get_domains, tags, server_side)
+        client_side = [name for name in include if name not in server_side]
+        if client_side:
+            await self.hydrate_domains(domains, client_side)
+
+        return domains
+
+    async def get_domain(self, domain_name: str) -> Domain:
+        return await self.requests.run(self.api.get_domain, domain_name)
+
+    async def get_invoice(self, invoice_number: str) -> Invoice:
+        return await self.requests.run(self.api.get_invoice, invoice_number)
+
+    async def get_invoices(self) -> [Invoice]:
+        return await self.requests.run(self.api.get_invoices)
+
+    async def get_invoice_as_pdf(self, invoice_number: str) -> str:
+        return await self.requests.run(self.api.get_invoice_as_pdf, invoice_number)
+
+    async def download_invoice_pdf(self, invoice_number: str, path: str, skip_existing: bool = True) -> str:
+        return await self.requests.run(self.api.download_invoice_pdf, invoice_number, path, skip_existing)
+
+    async def download_invoices(self, invoice_numbers: list, directory: str, workers: int = 4) -> list:
+        return await self.requests.run(self.api.download_invoices, invoice_numbers, directory, workers)
+
+    async def get_products(self) -> [Products]:
+        return await self.requests.run(self.api.get_products)
+
+    async def get_ssl_certificates_for_domain(self, domain: str) -> [SSL]:
+        return await self.requests.run(self.api.get_ssl_certificates_for_domain, domain)
+
+    async def scan_ssl_expiry(self, within_days: int = 30, tags: list = None, workers: int = 8, on_error=None) -> list:
+        """List of (domain name, SSL) expiring within within_days, see TransIpRestfulAPI.scan_ssl_expiry."""
+        return await self.requests.run(lambda: list(self.api.scan_ssl_expiry(within_days, tags, workers, on_error)))
+
+    async def test_connection(self) -> bool:
+        return await self.requests.run(self.api.test_connection)
+
+    # ### Domain getters ### #
+
+    async def get_branding(self, domain: Domain) -> Branding:
+        return await self.requests.run(domain.get_branding)
+
+    async def get_contacts(self, domain: Domain) -> Contacts:
+        return await self.requests.run(domain.get_contacts)
+
+    async def get_dnses(self, domain: Domain) -> DNSes:
+        return await self.requests.run(domain.get_dnses)
+
+    async def get_name_servers(self, domain: Domain) -> [NameServers]:
+        return await self.requests.run(domain.get_name_servers)
+
+    async def get_ssl_certificates(self, domain: Domain) -> [SSL]:
+        return await self.requests.run(domain.get_ssl_certificates)
+
+    async def hydrate_domains(self, domains: [Domain], include: list = None, limit: int = None) -> [Domain]:
+        """Fill the included lazy fields of the domains concurrently, all of them by default.
+
+        limit defaults to and may not exceed concurrency.
+        """
+        include = list(Domain.includes) if include is None else include
+        unknown = [name for name in include if name not in Domain.includes]
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown include: {', '.join(unknown)}")
+
+        await self.gather(
+            *(self.requests.run(getattr(domain, Domain.includes[name])) for domain in domains for name in include),
+            limit=limit
+        )
+        return domains
+
+    # ### Post requests ### #
+
+    async def create_domain(self, domain_name: str, *args, **kwargs):
+        return await self.requests.run(self.api.create_domain, domain_name, *args, **kwargs)
+
+    async def create_domains(self, domains: list, workers: int = 8, update_model: bool = True) -> list:
+        return await self.requests.run(self.api.create_domains, domains, workers, update_model)
+
+    async def create_dns_entry_for_domain(self, domain: str, name: str, expire: int, dtype: str, content: str):
+        return await self.requests.run(self.api.create_dns_entry_for_domain, domain, name, expire, dtype, content)
+
+    async def create_dns_entries(self, operations: list, workers: int = 8) -> list:
+        return await self.requests.run(self.api.create_dns_entries, operations, workers)
+
+    async def transfer_domain(self, domain_name: str, transfer_code: str, *args, **kwargs):
+        return await self.requests.run(self.api.transfer_domain, domain_name, transfer_code, *args, **kwargs)
+
+    async def transfer_domains(self, transfers: list, workers: int = 8, update_model: bool = True) -> list:
+        return await self.requests.run(self.api.transfer_domains, transfers, workers, update_model)
@@ -0,0 +1,276 @@
+import hashlib
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+from TransIpRestfulAPI import TransIpRestfulAPI
+
+from Models import *
+
+
+class WatchEvent:
+    """Change found by ChangeWatcher.
+
+    kind is `added`, `changed` or `removed`, resource is `domain`, `dns` or
+    `ssl`. old and new are the Domain, DNS or SSL before and after the
+    change, None for the side that does not exist.
+    """
+
+    __slots__ = ('kind', 'resource', 'domain', 'old', 'new')
+
+    added = 'added'
+    changed = 'changed'
+    removed = 'removed'
+
+    def __init__(self, kind: str, resource: str, domain: str, old=None, new=None):
+        self.kind = kind
+        self.resource = resource
+        self.domain = domain
+        self.old = old
+        self.new = new
+
+    def __repr__(self) -> str:
+        return f'WatchEvent({self.kind}, {self.resource}, {self.domain})'
+
+
+class ChangeWatcher:
+    """Poll domains, dns entries and ssl certificates and report the differences as WatchEvents.
+
+    The domain listing is polled every listing_interval seconds. The dns
+    and ssl of every domain are polled on their own interval, which starts
+    at min_interval, grows by backoff for every poll without changes up to
+    max_interval and drops back to min_interval when something changed.
+    Responses are fingerprinted, an unchanged fingerprint skips the
+    comparison. The first poll only records the state unless emit_initial
+    is set, domains added later are reported with their dns and ssl.
+    """
+
+    def __init__(
+            self,
+            api: TransIpRestfulAPI,
+            resources: tuple = ('dns', 'ssl'),
+            tags: list = None,
+            listing_interval: float = 300.0,
+            min_interval: float = 60.0,
+            max_interval: float = 3600.0,
+            backoff: float = 2.0,
+            workers: int = 8,
+            emit_initial: bool = False
+    ):
+        unknown = [resource for resource in resources if resource not in ('dns', 'ssl')]
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown resource: {', '.join(unknown)}")
+
+        self.api = api
+        self.resources = tuple(resources)
+        self.tags = tags
+        self.listing_interval = listing_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.workers = workers
+        self.emit_initial = emit_initial
+        self.callbacks = []
+        self._lock = threading.Lock()
+        self._domains = {}
+        self._state = {}
+        self._intervals = {}
+        self._due = {}
+        self._announce = set()
+        self._listing_due = 0.0
+        self._listed = False
+
+    def add_callback(self, callback):
+        """Call callback(event) for every event, from the polling thread."""
+        self.callbacks.append(callback)
+
+    def next_poll_in(self) -> float:
+        """Seconds until the listing or a domain is due."""
+        with self._lock:
+            due = min([self._listing_due, *self._due.values()])
+
+        return max(due - monotonic(), 0.0)
+
+    def poll(self) -> list:
+        """Poll everything that is due, return and dispatch the events.
+
+        A domain that fails is polled again after its interval, the first
+        error is raised after the events of the other domains are dispatched.
+        """
+        events = []
+        if monotonic() >= self._listing_due:
+            events += self._poll_listing()
+
+        now = monotonic()
+        with self._lock:
+            due = [name for name, at in self._due.items() if at <= now]
+
+        errors = []
+        if due and self.resources:
+            with ThreadPoolExecutor(max_workers=max(min(self.workers, len(due)), 1)) as executor:
+                for future in [executor.submit(self._poll_domain, name) for name in due]:
+                    try:
+                        events += future.result()
+                    except Exception as error:
+                        errors.append(error)
+
+        for event in events:
+            for callback in self.callbacks:
+                callback(event)
+
+        if errors:
+            raise errors[0]
+
+        return events
+
+    def run(self, stop: threading.Event = None, on_error=None):
+        """Poll until stop is set, errors are passed to on_error or raised."""
+        stop = threading.Event() if stop is None else stop
+        while not stop.is_set():
+            try:
+                self.poll()
+            except Exception as error:
+                if on_error is None:
+                    raise
+
+                on_error(error)
+
+            stop.wait(self.next_poll_in())
+
+    async def iterate(self):
+        """Async iterator of events, polling on the default executor."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            for event in await loop.run_in_executor(None, self.poll):
+                yield event
+
+            await asyncio.sleep(self.next_poll_in())
+
+    # ### Polling ### #
+
+    def _poll_listing(self) -> list:
+        initial = not self._listed
+        self._listing_due = monotonic() + self.listing_interval
+        domains = {domain.name: domain for domain in self.api.get_domains(self.tags)}
+
+        events = []
+        for name, domain in domains.items():
+            fingerprint = self._fingerprint(self._domain_fields(domain))
+            known = self._domains.get(name)
+            if known is None:
+                with self._lock:
+                    if not initial or self.emit_initial:
+                        events.append(WatchEvent(WatchEvent.added, 'domain', name, None, domain))
+                        self._announce.add(name)
+                    self._due[name] = 0.0
+                    self._intervals[name] = self.min_interval
+            elif known[0] != fingerprint:
+                events.append(WatchEvent(WatchEvent.changed, 'domain', name, known[1], domain))
+
+            self._domains[name] = (fingerprint, domain)
+
+        self._listed = True
+
+        for name in [name for name in self._domains if name not in domains]:
+            events.append(WatchEvent(WatchEvent.removed, 'domain', name, self._domains.pop(name)[1], None))
+            with self._lock:
+                self._due.pop(name, None)
+                self._intervals.pop(name, None)
+                self._announce.discard(name)
+                for resource in self.resources:
+                    self._state.pop((name, resource), None)
+
+        return events
+
+    def _poll_domain(self, name: str) -> list:
+        with self._lock:
+            if name in self._intervals:
+                self._due[name] = monotonic() + self._intervals[name]
+
+        events = []
+        for resource in self.resources:
+            if resource == 'dns':
+                items = {}
+                for dns in self.api.get_dns_for_domain(name).dnses:
+                    items.setdefault(dns.key(), []).append(dns)
+            else:
+                items = {ssl.certificate_id: [ssl] for ssl in self.api.get_ssl_certificates_for_domain(name)}
+
+            fingerprint = self._fingerprint(sorted(
+                (repr(key), self._fields(resource, item)) for key, values in items.items() for item in values
+            ))
+            with self._lock:
+                known = self._state.get((name, resource))
+                self._state[(name, resource)] = (fingerprint, items)
+                announce = name in self._announce
+
+            if known is None:
+                if announce:
+                    events += [
+                        WatchEvent(WatchEvent.added, resource, name, None, item)
+                        for values in items.values() for item in values
+                    ]
+            elif known[0] != fingerprint:
+                diff = self._diff_dns if resource == 'dns' else self._diff_ssl
+                events += diff(name, known[1], items)
+
+        with self._lock:
+            self._announce.discard(name)
+            if name in self._intervals:
+                # poll changing domains often and stable ones less
+                interval = self.min_interval if events else min(self._intervals[name] * self.backoff, self.max_interval)
+                self._intervals[name] = interval
+                self._due[name] = monotonic() + interval
+
+        return events
+
+    # ### Comparing ### #
+
+    @staticmethod
+    def _fingerprint(values) -> str:
+        return hashlib.sha1(repr(values).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _domain_fields(domain: Domain) -> tuple:
+        return (
+            domain.name, domain.auth_code, domain.is_transfer_locked, domain.registration_date,
+            domain.renewal_date, domain.is_whitelabel, domain.cancellation_date,
+            domain.cancellation_status, domain.is_dns_only, sorted(domain.tags or [])
+        )
+
+    @staticmethod
+    def _fields(resource: str, item) -> tuple:
+        if resource == 'dns':
+            return item.key()
+
+        return item.certificate_id, item.common_name, item.expiration_date, item.status
+
+    @staticmethod
+    def _diff_dns(name: str, old: dict, new: dict) -> list:
+        """Events for the difference of two zones, compared like DNSes.sync."""
+        removed, added, updated, _ = DNSes.diff(
+            [key for key, values in old.items() for _ in values],
+            [key for key, values in new.items() for _ in values]
+        )
+        events = [WatchEvent(WatchEvent.changed, 'dns', name, old[before][0], new[after][0]) for before, after in updated]
+        events += [WatchEvent(WatchEvent.removed, 'dns', name, old[key][0], None) for key in removed.elements()]
+        events += [WatchEvent(WatchEvent.added, 'dns', name, None, new[key][0]) for key in added.elements()]
+        return events
+
+    @staticmethod
+    def _diff_ssl(name: str, old: dict, new: dict) -> list:
+        events = []
+        for certificate_id, (ssl,) in new.items():
+            if certificate_id not in old:
+                events.append(WatchEvent(WatchEvent.added, 'ssl', name, None, ssl))
+            elif ChangeWatcher._fields('ssl', old[certificate_id][0]) != ChangeWatcher._fields('ssl', ssl):
+                events.append(WatchEvent(WatchEvent.changed, 'ssl', name, old[certificate_id][0], ssl))
+
+        for certificate_id, (ssl,) in old.items():
+            if certificate_id not in new:
+                events.append(WatchEvent(WatchEvent.removed, 'ssl', name, ssl, None))
+
+        return events
@@ -0,0 +1,84 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from HttpLogic.RequestTypes import ApiRequests
+
+
+class AsyncApiRequests:
+    """Awaitable wrapper around ApiRequests.
+
+    This is a thread backed client, not an asyncio native one. The blocking
+    calls run on a pool of max_workers threads that shares the pooled
+    session of the wrapped ApiRequests, so models built from the results keep
+    working with their regular synchronous getters. At most max_workers
+    requests are in flight, whatever the event loop schedules.
+    """
+
+    def __init__(self, connection: ApiRequests, max_workers: int = 10):
+        self.connection = connection
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='transip')
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking callable on the request pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def perform_get_request(self, url: str, wrapper):
+        """Get data from API."""
+        return await self.run(self.connection.perform_get_request, url, wrapper)
+
+    async def perform_post_request(self, url: str, data: dict):
+        """Post data to API."""
+        return await self.run(self.connection.perform_post_request, url, data)
+
+    async def perform_put_request(self, url: str, data: dict):
+        """Replace data in API."""
+        return await self.run(self.connection.perform_put_request, url, data)
+
+    async def perform_patch_request(self, url: str, data: dict):
+        """Update data in API."""
+        return await self.run(self.connection.perform_patch_request, url, data)
+
+    async def perform_delete_request(self, url: str, data: dict = None):
+        """Delete data from API."""
+        return await self.run(self.connection.perform_delete_request, url, data)
+
+    async def gather(self, *awaitables, limit: int = None, return_exceptions: bool = False) -> list:
+        """Await all awaitables with at most `limit` running at the same time.
+
+        limit defaults to max_workers and cannot exceed it, the request
+        threads already bound the concurrency.
+        """
+        if limit is not None and limit > self.max_workers:
+            for awaitable in awaitables:
+                if asyncio.iscoroutine(awaitable):
+                    awaitable.close()
+
+            raise ValueError(f'limit {limit} exceeds the {self.max_workers} request threads, raise max_workers instead')
+
+        return await gather_limited(
+            awaitables,
+            self.max_workers if limit is None else limit,
+            return_exceptions
+        )
+
+    def close(self):
+        """Stop the request pool."""
+        self._executor.shutdown(wait=False)
+
+
+async def gather_limited(awaitables, limit: int, return_exceptions: bool = False) -> list:
+    """asyncio.gather with bounded concurrency, results keep the input order."""
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def bounded(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(
+        *(bounded(awaitable) for awaitable in awaitables),
+        return_exceptions=return_exceptions
+    )
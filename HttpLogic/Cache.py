@@ -0,0 +1,236 @@
+import re
+import threading
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from time import time
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str):
+    """Regex of a ttl pattern, `*` matches exactly one path segment."""
+    return re.compile('/'.join('[^/]+' if part == '*' else re.escape(part) for part in pattern.split('/')))
+
+
+class CacheEntry:
+    """Cached response body."""
+
+    def __init__(self, content: bytes, etag: str, expires_at: float):
+        self.content = content
+        self.etag = etag
+        self.expires_at = expires_at
+
+    def fresh(self) -> bool:
+        return time() < self.expires_at
+
+
+class ResponseCache(ABC):
+    """Base for GET response caches.
+
+    ttls maps url patterns (without query string, `*` matches one path
+    segment) to the amount of seconds a response stays fresh. Urls without a matching
+    pattern are not cached. Stale entries with an ETag are revalidated with
+    If-None-Match instead of being downloaded again. Urls may end in a
+    `#namespace`, ApiRequests uses it to keep the responses of different
+    logins and token scopes apart.
+    """
+
+    default_ttls = {
+        '/availability-zones': 24 * 3600,
+        '/products': 3600,
+        '/products/*/elements': 3600,
+        '/invoices/*': 3600,
+        '/domains/*/ssl': 3600,
+    }
+
+    def __init__(self, ttls: dict = None, max_bytes: int = 32 * 1024 * 1024):
+        self.ttls = dict(self.default_ttls if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0, 'invalidations': 0}
+
+    def ttl(self, url: str):
+        """Return ttl for url or None when the url is not cached."""
+        path = url.split('#')[0].split('?')[0]
+        for pattern, ttl in self.ttls.items():
+            if _compile(pattern).fullmatch(path):
+                return ttl
+
+        return None
+
+    def lookup(self, url: str):
+        """Return entry for url, fresh or not, and count the hit or miss."""
+        entry = self._get(url)
+        self._count('hits' if entry is not None and entry.fresh() else 'misses')
+        return entry
+
+    def store(self, url: str, content: bytes, etag: str = None, revalidated: bool = False):
+        """Store response content for url."""
+        ttl = self.ttl(url)
+        if ttl is None:
+            return
+
+        if revalidated:
+            self._count('revalidated')
+
+        self._set(url, CacheEntry(content, etag, time() + ttl))
+        self._count('evictions', self._evict())
+
+    def invalidate(self, url: str):
+        """Drop all entries for url and the urls below it, in every namespace."""
+        self._count('invalidations', self._delete_prefix(url.split('#')[0].split('?')[0]))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._stats[counter] += amount
+
+    @abstractmethod
+    def _get(self, url: str):
+        pass
+
+    @abstractmethod
+    def _set(self, url: str, entry: CacheEntry):
+        pass
+
+    @staticmethod
+    def _below(url: str, prefix: str) -> bool:
+        """Whether url is prefix or below it, /invoices/1 does not cover /invoices/10."""
+        return url.startswith(prefix) and (len(url) == len(prefix) or url[len(prefix)] in '/?#')
+
+    @abstractmethod
+    def _delete_prefix(self, prefix: str) -> int:
+        """Delete the entries _below() prefix."""
+
+    @abstractmethod
+    def _evict(self) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class MemoryCache(ResponseCache):
+    """In memory LRU response cache."""
+
+    def __init__(self, ttls: dict = None, max_bytes: int = 32 * 1024 * 1024):
+        super().__init__(ttls, max_bytes)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._entries_lock = threading.Lock()
+
+    def _get(self, url: str):
+        with self._entries_lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+
+            return entry
+
+    def _set(self, url: str, entry: CacheEntry):
+        with self._entries_lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._size -= len(old.content)
+
+            self._entries[url] = entry
+            self._size += len(entry.content)
+
+    def _delete_prefix(self, prefix: str) -> int:
+        with self._entries_lock:
+            urls = [url for url in self._entries if self._below(url, prefix)]
+            for url in urls:
+                self._size -= len(self._entries.pop(url).content)
+
+            return len(urls)
+
+    def _evict(self) -> int:
+        evicted = 0
+        with self._entries_lock:
+            while self._size > self.max_bytes and len(self._entries) > 0:
+                _, entry = self._entries.popitem(last=False)
+                self._size -= len(entry.content)
+                evicted += 1
+
+        return evicted
+
+    def clear(self):
+        with self._entries_lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class SqliteCache(ResponseCache):
+    """On disk LRU response cache, shared between runs."""
+
+    def __init__(self, path: str, ttls: dict = None, max_bytes: int = 256 * 1024 * 1024):
+        import sqlite3
+
+        super().__init__(ttls, max_bytes)
+        self.path = path
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db_lock, self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'url TEXT PRIMARY KEY, content BLOB, etag TEXT, expires_at REAL, used_at REAL, size INTEGER)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)')
+
+    def _get(self, url: str):
+        with self._db_lock, self._db:
+            row = self._db.execute(
+                'SELECT content, etag, expires_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._db.execute('UPDATE responses SET used_at = ? WHERE url = ?', (time(), url))
+
+        return CacheEntry(*row)
+
+    def _set(self, url: str, entry: CacheEntry):
+        with self._db_lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                (url, entry.content, entry.etag, entry.expires_at, time(), len(entry.content))
+            )
+
+    def _delete_prefix(self, prefix: str) -> int:
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        with self._db_lock, self._db:
+            return self._db.execute(
+                "DELETE FROM responses WHERE url = ? OR url LIKE ? ESCAPE '\\' "
+                "OR url LIKE ? ESCAPE '\\' OR url LIKE ? ESCAPE '\\'",
+                (prefix, f'{escaped}/%', f'{escaped}?%', f'{escaped}#%')
+            ).rowcount
+
+    def _evict(self) -> int:
+        evicted = 0
+        with self._db_lock, self._db:
+            size = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            rows = self._db.execute('SELECT url, size FROM responses ORDER BY used_at')
+            urls = []
+            for url, entry_size in rows:
+                if size <= self.max_bytes:
+                    break
+
+                urls.append((url,))
+                size -= entry_size
+                evicted += 1
+
+            self._db.executemany('DELETE FROM responses WHERE url = ?', urls)
+
+        return evicted
+
+    def clear(self):
+        with self._db_lock, self._db:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        self._db.close()
@@ -22,5 +22,11 @@ class NotEditableError(Exception):
         self.api_message = api_message
 
 
+class RateLimitError(Exception):
+    def __init__(self, message, api_message):
+        super().__init__(message)
+        self.api_message = api_message
+
+
 class ReadOnlyTokenError(Exception):
     pass
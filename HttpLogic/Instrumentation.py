@@ -0,0 +1,142 @@
+import threading
+
+from time import time_ns
+
+
+class Instrumentation:
+    """Request hooks and per endpoint metrics shared by ApiRequests and TransIpAuthenticate.
+
+    Before hooks are called with (method, endpoint), after hooks with
+    (method, endpoint, status, seconds, size, error). Endpoints are url
+    templates, `/domains/example.nl/dns` is recorded as `/domains/{id}/dns`.
+    """
+
+    buckets = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: tuple = None):
+        self.buckets = tuple(sorted(self.buckets if buckets is None else buckets))
+        self.before_hooks = []
+        self.after_hooks = []
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._bytes = {}
+        self._requests = {}
+        self.retries = 0
+        self.authentications = 0
+
+    def add_before_hook(self, hook):
+        self.before_hooks.append(hook)
+
+    def add_after_hook(self, hook):
+        self.after_hooks.append(hook)
+
+    @staticmethod
+    def endpoint(url: str) -> str:
+        """Url template, every second path segment is an identifier."""
+        segments = url.split('?')[0].strip('/').split('/')
+        return '/' + '/'.join('{id}' if i % 2 else segment for i, segment in enumerate(segments))
+
+    def before(self, method: str, url: str):
+        endpoint = self.endpoint(url)
+        for hook in self.before_hooks:
+            hook(method.upper(), endpoint)
+
+    def after(self, method: str, url: str, status: int, seconds: float, size: int, error: Exception = None):
+        method = method.upper()
+        endpoint = self.endpoint(url)
+        key = (method, endpoint)
+        with self._lock:
+            histogram = self._latency.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bucket in enumerate(self.buckets):
+                if seconds <= bucket:
+                    histogram[0][i] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+            self._bytes[key] = self._bytes.get(key, 0) + size
+            status_key = (method, endpoint, 'error' if status is None else str(status))
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+
+        for hook in self.after_hooks:
+            hook(method, endpoint, status, seconds, size, error)
+
+    def retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def authenticated(self):
+        with self._lock:
+            self.authentications += 1
+
+    def snapshot(self) -> dict:
+        """Copy of all metrics, latency per endpoint as bucket counts, sum and count."""
+        with self._lock:
+            return {
+                'latency': {
+                    key: {'buckets': dict(zip(self.buckets, counts)), 'sum': total, 'count': count}
+                    for key, (counts, total, count) in self._latency.items()
+                },
+                'bytes': dict(self._bytes),
+                'requests': dict(self._requests),
+                'retries': self.retries,
+                'authentications': self.authentications
+            }
+
+    def prometheus_text(self, prefix: str = 'transip') -> str:
+        """Export metrics in the Prometheus text exposition format."""
+        metrics = self.snapshot()
+        lines = [
+            f'# HELP {prefix}_request_duration_seconds Duration of API requests.',
+            f'# TYPE {prefix}_request_duration_seconds histogram',
+        ]
+        for (method, endpoint), histogram in sorted(metrics['latency'].items()):
+            labels = f'method="{method}",endpoint="{endpoint}"'
+            for bucket, count in histogram['buckets'].items():
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bucket}"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {histogram["sum"]}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {histogram["count"]}')
+
+        lines += [
+            f'# HELP {prefix}_requests_total API requests by status.',
+            f'# TYPE {prefix}_requests_total counter',
+        ]
+        for (method, endpoint, status), count in sorted(metrics['requests'].items()):
+            lines.append(f'{prefix}_requests_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}')
+
+        lines += [
+            f'# HELP {prefix}_response_bytes_total Bytes received from the API.',
+            f'# TYPE {prefix}_response_bytes_total counter',
+        ]
+        for (method, endpoint), size in sorted(metrics['bytes'].items()):
+            lines.append(f'{prefix}_response_bytes_total{{method="{method}",endpoint="{endpoint}"}} {size}')
+
+        lines += [
+            f'# HELP {prefix}_retries_total Retried API requests.',
+            f'# TYPE {prefix}_retries_total counter',
+            f'{prefix}_retries_total {metrics["retries"]}',
+            f'# HELP {prefix}_authentications_total Requested bearer tokens.',
+            f'# TYPE {prefix}_authentications_total counter',
+            f'{prefix}_authentications_total {metrics["authentications"]}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def add_opentelemetry_tracer(self, tracer):
+        """Record every request as a span on an opentelemetry tracer."""
+        def span(method, endpoint, status, seconds, size, error):
+            end = time_ns()
+            otel_span = tracer.start_span(
+                f'{method} {endpoint}',
+                start_time=end - int(seconds * 1e9),
+                attributes={
+                    'http.method': method,
+                    'http.route': endpoint,
+                    'http.status_code': -1 if status is None else status,
+                    'http.response_content_length': size
+                }
+            )
+            if error is not None:
+                otel_span.record_exception(error)
+
+            otel_span.end(end_time=end)
+
+        self.add_after_hook(span)
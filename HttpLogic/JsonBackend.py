@@ -0,0 +1,45 @@
+from importlib import import_module
+
+
+preference = ('orjson', 'ujson', 'json')
+
+_loads = None
+
+
+def _available(name: str) -> bool:
+    try:
+        import_module(name)
+    except ImportError:
+        return False
+
+    return True
+
+
+def __getattr__(name: str):
+    """Installed backends are looked up on first use, importing orjson or ujson costs startup time."""
+    if name == 'backends':
+        return {candidate: import_module(candidate).loads for candidate in preference if _available(candidate)}
+
+    if name == 'backend':
+        return next(candidate for candidate in preference if _available(candidate))
+
+    raise AttributeError(f'module {__name__} has no attribute {name}')
+
+
+def loads(data):
+    """Parse a response body, bytes are decoded by the backend without an intermediate str."""
+    if _loads is None:
+        set_backend(__getattr__('backend'))
+
+    return _loads(data)
+
+
+def set_backend(name: str):
+    """Select json backend, `json`, `ujson` or `orjson` when installed."""
+    global backend, _loads
+    if name not in preference or not _available(name):
+        available = ', '.join(candidate for candidate in preference if _available(candidate))
+        raise ValueError(f"Json backend {name} is not available, choose from {available}")
+
+    backend = name
+    _loads = import_module(name).loads
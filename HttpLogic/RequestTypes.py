@@ -1,62 +1,181 @@
 from __future__ import annotations
-import requests
-import json
 
+from time import perf_counter
+from urllib.parse import urlencode
+
+from HttpLogic import JsonBackend
 from HttpLogic.Exceptions import *
 from HttpLogic.Authenticate import TransIpAuthenticate
+from HttpLogic.Cache import ResponseCache
+from HttpLogic.Instrumentation import Instrumentation
+from HttpLogic.Scheduler import RequestScheduler
+from HttpLogic.Session import ConnectionPool
+from HttpLogic.SingleFlight import SingleFlight
 
 
 class ApiRequests:
 
-    def __init__(self, auth: TransIpAuthenticate, endpoint: str):
+    def __init__(
+            self,
+            auth: TransIpAuthenticate,
+            endpoint: str,
+            session: ConnectionPool = None,
+            cache: ResponseCache = None,
+            scheduler: RequestScheduler = None,
+            instrumentation: Instrumentation = None
+    ):
         self.auth = auth
         self.endpoint = endpoint
+        self.session = session if session is not None else auth.session
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.single_flight = SingleFlight()
 
     def perform_get_request(self, url: str, wrapper):
-        """Get data from API."""
+        """Get data from API, concurrent identical requests share one call."""
+        json_response = self.single_flight.do((url, self.auth.scope()), lambda: self._get_json(url))
+        return wrapper(json_response)
+
+    def _get_json(self, url: str):
+        """Get parsed body from cache or API."""
+        cached = None
+        key = self._cache_key(url)
+        if self.cache is not None and self.cache.ttl(url) is not None:
+            cached = self.cache.lookup(key)
+            if cached is not None and cached.fresh():
+                return JsonBackend.loads(cached.content)
+
         headers = {
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {self.auth.get_token()}'
         }
-        response = requests.get(f'{self.endpoint}{url}', headers=headers)
-        content = response.content.decode()
+        if cached is not None and cached.etag is not None:
+            headers['If-None-Match'] = cached.etag
+
+        response = self._send('get', url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self.cache.store(key, cached.content, cached.etag, revalidated=True)
+            return JsonBackend.loads(cached.content)
+
+        content = response.content
         self._check_status_code(response.status_code, content)
 
         if response.status_code == 200:
-            json_response = json.loads(content)
-            return wrapper(json_response)
+            if self.cache is not None:
+                self.cache.store(key, content, response.headers.get('ETag'))
+
+            return JsonBackend.loads(content)
 
         raise SystemError('Unexpected status thrown')
 
-    def perform_post_request(self, url: str, data: dict):
-        """Get post data from API"""
+    def _cache_key(self, url: str) -> str:
+        """Cache key of url, responses are only shared by requests of the same login and token scope."""
+        read_only, global_key = self.auth.scope()
+        return f'{url}#{self.auth.login}:{int(read_only)}:{int(global_key)}'
+
+    def perform_stream_request(self, url: str, consumer, chunk_size: int = 64 * 1024):
+        """Get data from API and pass the body to consumer chunk by chunk."""
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.auth.get_token()}'
+        }
+        response = self._send('get', url, headers=headers, stream=True)
+        with response:
+            if response.status_code != 200:
+                self._check_status_code(response.status_code, response.content)
+                raise SystemError('Unexpected status thrown')
+
+            for chunk in response.iter_content(chunk_size):
+                consumer(chunk)
+
+    def perform_post_request(self, url: str, data: dict) -> bool:
+        """Post data to API."""
+        return self._perform_write_request('post', url, data, 201)
+
+    def perform_put_request(self, url: str, data: dict) -> bool:
+        """Replace data in API."""
+        return self._perform_write_request('put', url, data, 204)
+
+    def perform_patch_request(self, url: str, data: dict) -> bool:
+        """Update data in API."""
+        return self._perform_write_request('patch', url, data, 204)
+
+    def perform_delete_request(self, url: str, data: dict = None) -> bool:
+        """Delete data from API."""
+        return self._perform_write_request('delete', url, data, 204)
+
+    def _perform_write_request(self, method: str, url: str, data, expected_status: int) -> bool:
+        """Send json body to API, only POST is not retried by the scheduler."""
         if self.auth.read_only:
-            raise ReadOnlyTokenError('Cant post request, auth token is read_only')
+            raise ReadOnlyTokenError(f'Cant {method} request, auth token is read_only')
 
         headers = {
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {self.auth.get_token()}'
         }
-        response = requests.post(f'{self.endpoint}{url}', data, headers=headers)
-        content = response.content.decode()
-        self._check_status_code(response.status_code, content)
+        response = self._send(method, url, idempotent=method != 'post', json=data, headers=headers)
+        if self.cache is not None:
+            self.cache.invalidate(url)
+
+        self._check_status_code(response.status_code, response.content)
 
-        if response.status_code != 201:
+        if response.status_code != expected_status:
             raise SystemError('Unexpected status thrown')
 
+        return True
+
+    @staticmethod
+    def build_query(params: dict) -> str:
+        """Build query string, empty values are left out and lists are comma separated."""
+        query = {
+            key: ','.join(str(item) for item in value) if isinstance(value, (list, tuple, set)) else value
+            for key, value in params.items()
+            if value is not None and value != '' and not (isinstance(value, (list, tuple, set)) and len(value) == 0)
+        }
+        return '' if len(query) == 0 else f"?{urlencode(query, safe=',')}"
+
+    def _send(self, method: str, url: str, idempotent: bool = True, stream: bool = False, **kwargs) -> requests.Response:
+        """Send request through the scheduler, every attempt is instrumented."""
+        attempts = 0
+
+        def attempt() -> requests.Response:
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                self.instrumentation.retry()
+
+            self.instrumentation.before(method, url)
+            start = perf_counter()
+            try:
+                response = self.session.request(method, f'{self.endpoint}{url}', stream=stream, **kwargs)
+            except Exception as error:
+                self.instrumentation.after(method, url, None, perf_counter() - start, 0, error)
+                raise
+
+            size = int(response.headers.get('Content-Length', 0)) if stream else len(response.content)
+            self.instrumentation.after(method, url, response.status_code, perf_counter() - start, size)
+            return response
+
+        return self.scheduler.execute(attempt, idempotent)
+
     @staticmethod
-    def _check_status_code(status_code: int, content: str):
+    def _check_status_code(status_code: int, content: bytes):
+        """Raise for error statuses, the body is only parsed when it is an error."""
         if status_code == 403:
-            raise RestrictedError("Action not allowed.", json.loads(content))
+            raise RestrictedError("Action not allowed.", JsonBackend.loads(content))
 
         if status_code == 404:
-            raise NotFoundError("Content not found.", json.loads(content))
+            raise NotFoundError("Content not found.", JsonBackend.loads(content))
 
         if status_code == 406:
-            raise NotValidError("Invalid data supplied.", json.loads(content))
+            raise NotValidError("Invalid data supplied.", JsonBackend.loads(content))
 
         if status_code == 409:
-            raise NotEditableError("Not editable data supplied.", json.loads(content))
+            raise NotEditableError("Not editable data supplied.", JsonBackend.loads(content))
+
+        if status_code == 429:
+            raise RateLimitError("Rate limit exceeded.", JsonBackend.loads(content))
 
         if status_code > 499:
-            raise ConnectionError(f'5xx error returned by API: {content}')
+            raise ConnectionError(f'5xx error returned by API: {content.decode()}')
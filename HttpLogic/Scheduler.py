@@ -0,0 +1,128 @@
+from __future__ import annotations
+import random
+import threading
+
+from contextlib import ExitStack
+from time import monotonic, sleep, time
+
+
+class RequestScheduler:
+    """Client side rate limiting and retries for ApiRequests.
+
+    A token bucket shared by all threads using the scheduler keeps requests
+    under `rate` per second. The X-Rate-Limit-* headers of every response
+    correct the bucket, when the API reports no requests are left the
+    scheduler waits until the reported reset. Idempotent requests are
+    retried on 429, 5xx and connection errors with jittered exponential
+    backoff, other requests only on 429. Every attempt holds all semaphores
+    in limits, in order, while it is sent.
+    """
+
+    retry_status_codes = (429, 500, 502, 503, 504)
+
+    def __init__(
+            self,
+            rate: float = 1000 / 60,
+            burst: int = 20,
+            max_retries: int = 4,
+            backoff: float = 0.5,
+            max_backoff: float = 30.0,
+            limits: tuple = ()
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limits = tuple(limits)
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._blocked_until = 0.0
+        self._stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0, 'rate_limited': 0}
+
+    def execute(self, send, idempotent: bool = True) -> requests.Response:
+        """Call send() when the bucket allows it, retrying when needed."""
+        import requests
+
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                response = self._send(send)
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+
+                self._retry_wait(attempt, None)
+                attempt += 1
+                continue
+
+            self._update(response)
+            retry = response.status_code == 429 or idempotent and response.status_code in self.retry_status_codes
+            if not retry or attempt >= self.max_retries:
+                return response
+
+            # give the connection of a streamed response back to the pool
+            response.close()
+            self._retry_wait(attempt, response.headers.get('Retry-After'))
+            attempt += 1
+
+    def stats(self) -> dict:
+        """Request counters, throttled_seconds is summed over all waiting threads."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _send(self, send):
+        """Call send() holding the concurrency limits."""
+        with ExitStack() as stack:
+            for limit in self.limits:
+                stack.enter_context(limit)
+
+            return send()
+
+    def _acquire(self):
+        """Take one token from the bucket, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = max(self._blocked_until - now, 0.0)
+                if wait == 0.0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._stats['requests'] += 1
+                    return
+
+                wait = max(wait, (1 - self._tokens) / self.rate)
+                self._stats['throttled_seconds'] += wait
+
+            sleep(wait)
+
+    def _update(self, response: requests.Response):
+        """Correct the bucket with the rate limit headers of the API."""
+        remaining = response.headers.get('X-Rate-Limit-Remaining')
+        reset = response.headers.get('X-Rate-Limit-Reset')
+        with self._lock:
+            if response.status_code == 429:
+                self._stats['rate_limited'] += 1
+
+            if remaining is None:
+                return
+
+            remaining = int(remaining)
+            self._tokens = min(self._tokens, remaining)
+            if (remaining == 0 or response.status_code == 429) and reset is not None:
+                self._blocked_until = max(self._blocked_until, monotonic() + max(float(reset) - time(), 0.0))
+
+    def _retry_wait(self, attempt: int, retry_after):
+        """Sleep before the next attempt, full jitter exponential backoff."""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+
+        with self._lock:
+            self._stats['retries'] += 1
+            self._stats['throttled_seconds'] += delay
+
+        sleep(delay)
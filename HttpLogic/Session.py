@@ -0,0 +1,87 @@
+from __future__ import annotations
+import threading
+
+
+class ConnectionPool:
+    """Keep-alive HTTP session shared by the authenticator and the api requests."""
+
+    def __init__(
+            self,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            pool_block: bool = False,
+            timeout: float = 30.0,
+            keep_alive: bool = True
+    ):
+        """ConnectionPool init.
+
+        pool_connections is the amount of hosts kept in the pool,
+        pool_maxsize the amount of open connections per host.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._adapter = None
+        self._session = None
+
+    def _open(self):
+        """Create the requests session on first use, importing requests is slow."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session = requests.Session()
+        session.mount('https://', self._adapter)
+        session.mount('http://', self._adapter)
+        session.headers['Connection'] = 'keep-alive' if self.keep_alive else 'close'
+        self._session = session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Perform request over a pooled connection."""
+        kwargs.setdefault('timeout', self.timeout)
+        with self._lock:
+            if self._session is None:
+                self._open()
+            self._request_count += 1
+
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Perform get request."""
+        return self.request('get', url, **kwargs)
+
+    def post(self, url: str, data=None, **kwargs) -> requests.Response:
+        """Perform post request."""
+        return self.request('post', url, data=data, **kwargs)
+
+    def stats(self) -> dict:
+        """Return connection reuse statistics."""
+        connection_pools = []
+        if self._adapter is not None:
+            pools = self._adapter.poolmanager.pools
+            with pools.lock:
+                connection_pools = [pools[key] for key in pools.keys()]
+
+        opened = sum(pool.num_connections for pool in connection_pools)
+        with self._lock:
+            requests_made = self._request_count
+
+        return {
+            'requests': requests_made,
+            'connections_opened': opened,
+            'connections_reused': max(requests_made - opened, 0),
+            'hosts': len(connection_pools)
+        }
+
+    def close(self):
+        """Close all pooled connections."""
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,66 @@
+import base64
+import hashlib
+import re
+
+
+class Base64FieldWriter:
+    """Decode one base64 string field of a streamed JSON body straight into a file.
+
+    Only the current chunk and at most a few pending base64 characters are
+    kept in memory. The sha256 and size of the written bytes are tracked.
+    """
+
+    def __init__(self, field: str, file):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self._marker = re.compile(b'"' + re.escape(field.encode('utf-8')) + rb'"\s*:\s*"')
+        self._head = b''
+        self._in_field = False
+        self._done = False
+        self._pending = b''
+
+    def feed(self, chunk: bytes):
+        """Consume the next chunk of the response body."""
+        if self._done:
+            return
+
+        if not self._in_field:
+            self._head += chunk
+            match = self._marker.search(self._head)
+            if match is None:
+                self._head = self._head[-256:]
+                return
+
+            chunk = self._head[match.end():]
+            self._head = b''
+            self._in_field = True
+
+        data = self._pending + chunk
+        end = data.find(b'"')
+        if end != -1:
+            data = data[:end]
+            self._done = True
+
+        # an escape sequence may be split over two chunks
+        hold = b''
+        if not self._done and data.endswith(b'\\'):
+            data, hold = data[:-1], b'\\'
+
+        data = data.replace(b'\\/', b'/').replace(b'\\n', b'').replace(b'\\r', b'')
+        usable = len(data) if self._done else len(data) - len(data) % 4
+        self._write(base64.b64decode(data[:usable]))
+        self._pending = data[usable:] + hold
+
+    def close(self):
+        """Check the whole field was received."""
+        if not self._done:
+            raise ValueError('Response ended before the base64 field was complete.')
+
+    def _write(self, data: bytes):
+        if len(data) == 0:
+            return
+
+        self.file.write(data)
+        self.sha256.update(data)
+        self.size += len(data)
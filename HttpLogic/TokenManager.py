@@ -0,0 +1,116 @@
+import threading
+
+from time import monotonic
+
+
+class TokenManager:
+    """Thread safe token cache with one token per scope.
+
+    Tokens are refreshed on a background timer shortly before they expire, as
+    long as they have been used since the last refresh. Concurrent callers
+    asking for a missing or expired token share a single refresh.
+    """
+
+    def __init__(self, fetch, refresh_margin: float = 60.0, background: bool = True):
+        """TokenManager init.
+
+        fetch is called with a scope and returns a tuple of the token and its
+        lifetime in seconds.
+        """
+        self._fetch = fetch
+        self.refresh_margin = refresh_margin
+        self.background = background
+        self._lock = threading.Lock()
+        self._scope_locks = {}
+        self._tokens = {}
+        self._timers = {}
+        self._used = set()
+
+    def get(self, scope) -> str:
+        """Return a valid token for scope, refreshing it when needed."""
+        token = self._valid_token(scope)
+        if token is not None:
+            return token
+
+        with self._scope_lock(scope):
+            token = self._valid_token(scope)
+            if token is not None:
+                return token
+
+            return self._refresh(scope)
+
+    def peek(self, scope):
+        """Return the cached token for scope without refreshing."""
+        with self._lock:
+            cached = self._tokens.get(scope)
+
+        return None if cached is None else cached[0]
+
+    def invalidate(self, scope=None):
+        """Forget the token of scope, or all tokens."""
+        with self._lock:
+            scopes = list(self._tokens) if scope is None else [scope]
+            for key in scopes:
+                self._tokens.pop(key, None)
+                self._used.discard(key)
+                timer = self._timers.pop(key, None)
+                if timer is not None:
+                    timer.cancel()
+
+    def close(self):
+        """Stop all background refreshes."""
+        self.invalidate()
+
+    def margin(self, lifetime: float) -> float:
+        """Seconds before expiry a token of lifetime is refreshed."""
+        return min(self.refresh_margin, lifetime / 4)
+
+    def _valid_token(self, scope):
+        with self._lock:
+            cached = self._tokens.get(scope)
+            if cached is None or monotonic() >= cached[1]:
+                return None
+
+            self._used.add(scope)
+            return cached[0]
+
+    def _scope_lock(self, scope) -> threading.Lock:
+        with self._lock:
+            return self._scope_locks.setdefault(scope, threading.Lock())
+
+    def _refresh(self, scope) -> str:
+        """Fetch a new token, caller holds the scope lock."""
+        token, lifetime = self._fetch(scope)
+        margin = self.margin(lifetime)
+        with self._lock:
+            # stop using the token a second early so it never expires in flight
+            self._tokens[scope] = (token, monotonic() + lifetime - 1)
+            self._used.discard(scope)
+            timer = self._timers.pop(scope, None)
+            if timer is not None:
+                timer.cancel()
+
+            if self.background:
+                timer = threading.Timer(max(lifetime - margin, 1), self._background_refresh, (scope,))
+                timer.daemon = True
+                self._timers[scope] = timer
+                timer.start()
+
+        return token
+
+    def _background_refresh(self, scope):
+        with self._lock:
+            if self._timers.get(scope) is not threading.current_thread():
+                return  # invalidated or already refreshed
+
+            if scope not in self._used:
+                del self._timers[scope]
+                return
+
+        with self._scope_lock(scope):
+            try:
+                self._refresh(scope)
+            except Exception:
+                # callers refresh on demand once the token expired
+                with self._lock:
+                    self._timers.pop(scope, None)
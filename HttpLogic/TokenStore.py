@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import threading
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from time import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class TokenStore(ABC):
+    """Base for token stores shared between processes.
+
+    Tokens are stored per key, see TransIpAuthenticate.token_key. When no
+    stored token is usable a single process holds the store lock for that
+    key while it authenticates, the others wait and reuse the token it
+    stored instead of authenticating themselves.
+    """
+
+    def get(self, key: str, fetch, min_lifetime: float = 0.0) -> tuple:
+        """Return token and remaining lifetime for key.
+
+        fetch() returns a new token and its lifetime in seconds, it is called
+        when the stored token expires within min_lifetime seconds.
+        """
+        cached = self._read(key)
+        if cached is not None and cached[1] - time() > min_lifetime:
+            return cached[0], cached[1] - time()
+
+        with self._locked(key):
+            cached = self._read(key)
+            if cached is not None and cached[1] - time() > min_lifetime:
+                return cached[0], cached[1] - time()
+
+            token, lifetime = fetch()
+            self._write(key, token, time() + lifetime)
+            return token, lifetime
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def _read(self, key: str):
+        """Return (token, expires_at) or None."""
+
+    @abstractmethod
+    def _write(self, key: str, token: str, expires_at: float):
+        pass
+
+    @abstractmethod
+    def _locked(self, key: str):
+        """Context manager excluding other processes from refreshing key."""
+
+
+class FileTokenStore(TokenStore):
+    """Tokens as files in a directory, refreshes serialized with file locks.
+
+    Files are only readable by the current user, tokens grant access to the
+    account until they expire.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def delete(self, key: str):
+        try:
+            os.remove(f'{self._path(key)}.json')
+        except FileNotFoundError:
+            pass
+
+    def _read(self, key: str):
+        try:
+            with open(f'{self._path(key)}.json', 'rb') as token_file:
+                stored = json.loads(token_file.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+        return stored['token'], stored['expires_at']
+
+    def _write(self, key: str, token: str, expires_at: float):
+        path = f'{self._path(key)}.json'
+        temporary = f'{path}.{os.getpid()}.{threading.get_ident()}'
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w') as token_file:
+            json.dump({'key': key, 'token': token, 'expires_at': expires_at}, token_file)
+
+        os.replace(temporary, path)
+
+    @contextmanager
+    def _locked(self, key: str):
+        descriptor = os.open(f'{self._path(key)}.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(descriptor, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(descriptor, msvcrt.LK_LOCK, 1)
+
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(descriptor, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(descriptor, msvcrt.LK_UNLCK, 1)
+
+            os.close(descriptor)
+
+
+class SqliteTokenStore(TokenStore):
+    """Tokens in a sqlite database, refreshes serialized with an immediate transaction."""
+
+    def __init__(self, path: str, timeout: float = 60.0):
+        import sqlite3
+
+        self.path = path
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._db.execute('CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, token TEXT, expires_at REAL)')
+
+    def delete(self, key: str):
+        with self._lock:
+            self._db.execute('DELETE FROM tokens WHERE key = ?', (key,))
+
+    def _read(self, key: str):
+        with self._lock:
+            return self._db.execute('SELECT token, expires_at FROM tokens WHERE key = ?', (key,)).fetchone()
+
+    def _write(self, key: str, token: str, expires_at: float):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO tokens VALUES (?, ?, ?)', (key, token, expires_at))
+
+    @contextmanager
+    def _locked(self, key: str):
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                yield
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+
+            self._db.execute('COMMIT')
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,258 @@
+import hashlib
+import json
+import sqlite3
+import threading
+
+from datetime import date
+from time import time
+
+from TransIpRestfulAPI import TransIpRestfulAPI
+
+from Models import *
+from Models.DNSes import DNS
+
+
+class InventorySnapshot:
+    """Local sqlite copy of domains, dns entries, nameservers, ssl certificates and invoices.
+
+    refresh() lists the domains once and only fetches the sub resources of
+    domains that are new, changed since the last refresh or older than ttl
+    seconds.
+    """
+
+    schema = [
+        'CREATE TABLE IF NOT EXISTS domains ('
+        'name TEXT PRIMARY KEY, auth_code TEXT, is_transfer_locked INTEGER, registration_date TEXT, '
+        'renewal_date TEXT, is_whitelabel INTEGER, cancellation_date TEXT, cancellation_status TEXT, '
+        'is_dns_only INTEGER, payload_hash TEXT, fetched_at REAL)',
+        'CREATE INDEX IF NOT EXISTS domains_renewal_date ON domains (renewal_date)',
+        'CREATE TABLE IF NOT EXISTS domain_tags (domain TEXT, tag TEXT)',
+        'CREATE INDEX IF NOT EXISTS domain_tags_tag ON domain_tags (tag)',
+        'CREATE INDEX IF NOT EXISTS domain_tags_domain ON domain_tags (domain)',
+        'CREATE TABLE IF NOT EXISTS dns (domain TEXT, name TEXT, expire INTEGER, type TEXT, content TEXT)',
+        'CREATE INDEX IF NOT EXISTS dns_domain ON dns (domain)',
+        'CREATE INDEX IF NOT EXISTS dns_content ON dns (content)',
+        'CREATE TABLE IF NOT EXISTS nameservers (domain TEXT, hostname TEXT, ipv4 TEXT, ipv6 TEXT)',
+        'CREATE INDEX IF NOT EXISTS nameservers_domain ON nameservers (domain)',
+        'CREATE TABLE IF NOT EXISTS ssl ('
+        'domain TEXT, certificate_id INTEGER, common_name TEXT, expiration_date TEXT, status TEXT)',
+        'CREATE INDEX IF NOT EXISTS ssl_domain ON ssl (domain)',
+        'CREATE INDEX IF NOT EXISTS ssl_expiration_date ON ssl (expiration_date)',
+        'CREATE TABLE IF NOT EXISTS invoices ('
+        'invoice_number TEXT PRIMARY KEY, creation_date TEXT, pay_date TEXT, due_date TEXT, '
+        'invoice_status TEXT, currency TEXT, total_amount INTEGER, total_amount_incl_vat INTEGER)',
+    ]
+
+    def __init__(self, api: TransIpRestfulAPI, path: str, ttl: float = 24 * 3600, workers: int = 8):
+        self.api = api
+        self.path = path
+        self.ttl = ttl
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            for statement in self.schema:
+                self._db.execute(statement)
+
+    def close(self):
+        self._db.close()
+
+    # ### Refresh ### #
+
+    def refresh(self, force: bool = False) -> dict:
+        """Update the snapshot, returns the names of added, refreshed and removed domains.
+
+        A domain whose dns, nameservers or ssl cannot be fetched keeps its
+        stored rows and fetched_at, failed maps its name to the first error.
+        """
+        domains = self.api.get_domains()
+        with self._lock:
+            rows = self._db.execute('SELECT name, payload_hash, fetched_at FROM domains').fetchall()
+
+        known = {name: (payload_hash, fetched_at) for name, payload_hash, fetched_at in rows}
+
+        now = time()
+        stale = []
+        for domain in domains:
+            if force or domain.name not in known:
+                stale.append(domain)
+                continue
+
+            payload_hash, fetched_at = known[domain.name]
+            if payload_hash != self._hash(domain) or now - fetched_at > self.ttl:
+                stale.append(domain)
+
+        failed = {}
+        self.api.hydrate_domains(
+            stale,
+            ['dns', 'nameservers', 'ssl'],
+            self.workers,
+            lambda domain, error: failed.setdefault(domain.name, error)
+        )
+        stale = [domain for domain in stale if domain.name not in failed]
+
+        listed = {domain.name for domain in domains}
+        removed = [name for name in known if name not in listed]
+        with self._lock, self._db:
+            for name in removed:
+                self._delete_domain(name)
+
+            for domain in stale:
+                self._delete_domain(domain.name)
+                self._insert_domain(domain, now)
+
+        return {
+            'added': [domain.name for domain in stale if domain.name not in known],
+            'refreshed': [domain.name for domain in stale if domain.name in known],
+            'removed': removed,
+            'failed': failed
+        }
+
+    def refresh_invoices(self) -> int:
+        """Store all invoices, returns the amount stored."""
+        rows = [
+            (
+                invoice.invoice_number, invoice.creation_date.isoformat(), invoice.pay_date.isoformat(),
+                invoice.due_date.isoformat(), invoice.invoice_status, invoice.currency,
+                invoice.total_amount, invoice.total_amount_incl_vat
+            )
+            for invoice in self.api.iter_invoices()
+        ]
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM invoices')
+            self._db.executemany('INSERT INTO invoices VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+        return len(rows)
+
+    @staticmethod
+    def _hash(domain: Domain) -> str:
+        """Hash of the listing fields of a domain."""
+        payload = [
+            domain.name, domain.auth_code, domain.is_transfer_locked, str(domain.registration_date),
+            str(domain.renewal_date), domain.is_whitelabel, str(domain.cancellation_date),
+            domain.cancellation_status, domain.is_dns_only, sorted(domain.tags or [])
+        ]
+        return hashlib.sha1(json.dumps(payload).encode('utf-8')).hexdigest()
+
+    def _delete_domain(self, name: str):
+        for table, column in [('domains', 'name'), ('domain_tags', 'domain'), ('dns', 'domain'),
+                              ('nameservers', 'domain'), ('ssl', 'domain')]:
+            self._db.execute(f'DELETE FROM {table} WHERE {column} = ?', (name,))
+
+    def _insert_domain(self, domain: Domain, fetched_at: float):
+        self._db.execute('INSERT INTO domains VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+            domain.name, domain.auth_code, domain.is_transfer_locked,
+            None if domain.registration_date is None else domain.registration_date.isoformat(),
+            None if domain.renewal_date is None else domain.renewal_date.isoformat(),
+            domain.is_whitelabel,
+            None if domain.cancellation_date is None else domain.cancellation_date.isoformat(' '),
+            domain.cancellation_status, domain.is_dns_only, self._hash(domain), fetched_at
+        ))
+        self._db.executemany(
+            'INSERT INTO domain_tags VALUES (?, ?)',
+            [(domain.name, tag) for tag in domain.tags or []]
+        )
+        self._db.executemany(
+            'INSERT INTO dns VALUES (?, ?, ?, ?, ?)',
+            [(domain.name, d.name, d.expire, d.type, d.content) for d in domain.dnses.dnses]
+        )
+        self._db.executemany(
+            'INSERT INTO nameservers VALUES (?, ?, ?, ?)',
+            [(domain.name, n.hostname, n.ipv4, n.ipv6) for n in domain.name_servers]
+        )
+        self._db.executemany(
+            'INSERT INTO ssl VALUES (?, ?, ?, ?, ?)',
+            [
+                (domain.name, s.certificate_id, s.common_name, s.expiration_date.isoformat(), s.status)
+                for s in domain.ssl_certificates
+            ]
+        )
+
+    # ### Queries ### #
+
+    def get_domains(self, tag: str = None) -> [Domain]:
+        """Domains from the snapshot, optionally only those with tag."""
+        if tag is None:
+            return self._domains('SELECT * FROM domains ORDER BY name', ())
+
+        return self._domains(
+            'SELECT d.* FROM domains d JOIN domain_tags t ON t.domain = d.name WHERE t.tag = ? ORDER BY d.name',
+            (tag,)
+        )
+
+    def get_domains_renewing_before(self, before: date) -> [Domain]:
+        return self._domains(
+            'SELECT * FROM domains WHERE renewal_date < ? ORDER BY renewal_date',
+            (before.isoformat(),)
+        )
+
+    def get_dns_with_content(self, content: str) -> [DNS]:
+        """DNS entries of all domains pointing to content."""
+        rows = self._query('SELECT domain, name, expire, type, content FROM dns WHERE content = ?', (content,))
+        return [
+            DNS(self.api.requests, {'name': name, 'expire': expire, 'type': dtype, 'content': value}, domain)
+            for domain, name, expire, dtype, value in rows
+        ]
+
+    def get_ssl_certificates_expiring_before(self, before: date) -> list:
+        """Tuples of domain name and SSL, soonest expiring first."""
+        rows = self._query(
+            'SELECT domain, certificate_id, common_name, expiration_date, status FROM ssl '
+            'WHERE expiration_date < ? ORDER BY expiration_date',
+            (before.isoformat(),)
+        )
+        return [
+            (domain, SSL(self.api.requests, {
+                'certificateId': certificate_id, 'commonName': common_name,
+                'expirationDate': expiration_date, 'status': status
+            }))
+            for domain, certificate_id, common_name, expiration_date, status in rows
+        ]
+
+    def get_name_servers(self, domain: str) -> [NameServers]:
+        rows = self._query('SELECT hostname, ipv4, ipv6 FROM nameservers WHERE domain = ?', (domain,))
+        return [
+            NameServers(self.api.requests, {'hostname': hostname, 'ipv4': ipv4, 'ipv6': ipv6})
+            for hostname, ipv4, ipv6 in rows
+        ]
+
+    def get_invoices(self) -> [Invoice]:
+        rows = self._query('SELECT * FROM invoices ORDER BY creation_date', ())
+        return [
+            Invoice(self.api.requests, {
+                'invoiceNumber': row[0], 'creationDate': row[1], 'payDate': row[2], 'dueDate': row[3],
+                'invoiceStatus': row[4], 'currency': row[5], 'totalAmount': row[6], 'totalAmountInclVat': row[7]
+            })
+            for row in rows
+        ]
+
+    def _query(self, statement: str, parameters: tuple) -> list:
+        with self._lock:
+            return self._db.execute(statement, parameters).fetchall()
+
+    def _domains(self, statement: str, parameters: tuple) -> [Domain]:
+        rows = self._query(statement, parameters)
+        names = list({row[0] for row in rows})
+        tags = {}
+        # stay below the sqlite limit of 999 parameters per statement
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            for domain, tag in self._query(
+                    f"SELECT domain, tag FROM domain_tags WHERE domain IN ({', '.join('?' * len(chunk))})",
+                    tuple(chunk)
+            ):
+                tags.setdefault(domain, []).append(tag)
+
+        domains = []
+        for row in rows:
+            fields = {
+                'name': row[0], 'authCode': row[1], 'isTransferLocked': row[2], 'isWhitelabel': row[5],
+                'cancellationStatus': row[7], 'isDnsOnly': row[8], 'tags': tags.get(row[0], [])
+            }
+            for key, value in [('registrationDate', row[3]), ('renewalDate', row[4]), ('cancellationDate', row[6])]:
+                if value is not None:
+                    fields[key] = value
+
+            domains.append(Domain(self.api.requests, fields))
+
+        return domains
@@ -1,6 +1,8 @@
 class AvailabilityZone:
     """AvailabilityZone Model."""
 
+    __slots__ = ('name', 'country', 'default')
+
     def __init__(self, zone: dict):
         """AvailabilityZone init."""
         self.name = zone['name']
@@ -6,6 +6,11 @@ from HttpLogic.RequestTypes import ApiRequests
 class Branding:
     """Branding model."""
 
+    __slots__ = (
+        '_connection', 'domain', 'company_name', 'support_email', 'company_url',
+        'terms_of_usage_url', 'banner_1', 'banner_2', 'banner_3'
+    )
+
     def __init__(self, connection: ApiRequests, branding: dict):
         """Branding init."""
         self._connection = connection
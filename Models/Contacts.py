@@ -6,6 +6,8 @@ from HttpLogic.RequestTypes import ApiRequests
 class Contacts:
     """Contact collection object."""
 
+    __slots__ = ('_connection', 'domain', 'contacts')
+
     def __init__(self, connection: ApiRequests, contacts: list, domain):
         """Contact collection init"""
         self._connection = connection
@@ -33,6 +35,11 @@ class Contacts:
 class Contact:
     """Contact object."""
 
+    __slots__ = (
+        'type', 'first_name', 'last_name', 'company_name', 'company_kvk', 'company_type', 'street',
+        'number', 'postal_code', 'city', 'phone_number', 'fax_number', 'email', 'country'
+    )
+
     def __init__(self, contact: dict):
         """Contact init."""
         self.type = contact['type']
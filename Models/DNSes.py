@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+from collections import Counter
+
 from HttpLogic.RequestTypes import ApiRequests
 
 
 class DNSes:
     """Collection of DNS."""
 
+    __slots__ = ('_connection', 'domain', 'dnses')
+
+    types = ['A', 'AAAA', 'CNAME', 'MX', 'NS', 'TXT', 'SRV', 'SSHFP', 'TLSA']
+
     def __init__(self, connection: ApiRequests, dnses: list, domain):
         """Collection of DNS init."""
         self._connection = connection
         self.domain = domain
-        self.dnses = [DNS(connection, d) for d in dnses]
+        self.dnses = [DNS(connection, d, domain) for d in dnses]
 
     def _serialize(self) -> list:
         """Return self as list of dict."""
@@ -18,25 +24,119 @@ class DNSes:
 
     def add_dns(self, dns: dict) -> bool:
         """Add dns to list of DNSes."""
-        if dns['type'].upper() not in ['A', 'AAAA', 'CNAME', 'MX', 'NS', 'TXT', 'SRV', 'SSHFP', 'TLSA']:
+        if dns['type'].upper() not in self.types:
             raise ValueError('Type not known')
 
         request = f"/domains/{self.domain}/dns"
         response = self._connection.perform_post_request(
             request,
-            dns
+            {'dnsEntry': dns}
         )
 
         if response:
-            self.dnses.append(DNS(self._connection, dns))
+            self.dnses.append(DNS(self._connection, dns, self.domain))
 
         return response
 
-    def update_dnses(self):
-        """Update all DNSes."""
-        # request = f"/domains/{self.domain}/dns"
-        # data = self._serialize()
-        raise NotImplementedError('put not implemented')
+    def update_dnses(self) -> bool:
+        """Replace the zone with all DNSes."""
+        request = f"/domains/{self.domain}/dns"
+        return self._connection.perform_put_request(
+            request,
+            {'dnsEntries': self._serialize()}
+        )
+
+    def sync(self, desired_records: list, strategy: str = 'auto') -> dict:
+        """Make the zone equal to desired_records with as few requests as possible.
+
+        Records are compared on name, expire, type and content, see diff().
+        strategy `auto` sends a single PUT of the full zone when that saves
+        round trips, `put` and `incremental` force either.
+        """
+        if strategy not in ('auto', 'put', 'incremental'):
+            raise ValueError('strategy should be `auto`, `put` or `incremental`')
+
+        desired = [
+            DNS(self._connection, record, self.domain) if isinstance(record, dict) else record
+            for record in desired_records
+        ]
+        for record in desired:
+            if record.type.upper() not in self.types:
+                raise ValueError(f'Type not known: {record.type}')
+
+        removed, added, updated, unchanged = self.diff(
+            [record.key() for record in self.dnses],
+            [record.key() for record in desired]
+        )
+
+        report = {
+            'added': [DNS.from_key(self._connection, key, self.domain) for key in added.elements()],
+            'removed': [DNS.from_key(self._connection, key, self.domain) for key in removed.elements()],
+            'updated': [
+                (DNS.from_key(self._connection, old, self.domain), DNS.from_key(self._connection, new, self.domain))
+                for old, new in updated
+            ],
+            'unchanged': unchanged,
+            'method': None
+        }
+
+        requests = len(report['added']) + len(report['removed']) + len(report['updated'])
+        if requests == 0:
+            return report
+
+        if strategy == 'put' or strategy == 'auto' and requests > 1:
+            report['method'] = 'put'
+            previous, self.dnses = self.dnses, desired
+            try:
+                self.update_dnses()
+            except Exception:
+                self.dnses = previous
+                raise
+
+            return report
+
+        report['method'] = 'incremental'
+        request = f"/domains/{self.domain}/dns"
+        for dns in report['removed']:
+            self._connection.perform_delete_request(request, {'dnsEntry': dns.serialize()})
+
+        for _, dns in report['updated']:
+            self._connection.perform_patch_request(request, {'dnsEntry': dns.serialize()})
+
+        for dns in report['added']:
+            self._connection.perform_post_request(request, {'dnsEntry': dns.serialize()})
+
+        self.dnses = desired
+        return report
+
+    @staticmethod
+    def diff(current: list, desired: list) -> tuple:
+        """Compare two zones given as lists of DNS.key().
+
+        Returns the removed and added keys as Counters, the (old, new) key
+        pairs to patch and the amount of unchanged records. The API matches a
+        PATCH on name, expire and type, so a content change is only a patch
+        when its name, expire and type occur exactly once in both zones.
+        """
+        removed = Counter(current)
+        added = Counter(desired)
+        unchanged = removed & added
+        removed -= unchanged
+        added -= unchanged
+
+        current_slots = Counter(key[:3] for key in current)
+        desired_slots = Counter(key[:3] for key in desired)
+        removed_by_slot = {key[:3]: key for key in removed if current_slots[key[:3]] == 1}
+
+        updated = []
+        for key in list(added):
+            old = removed_by_slot.get(key[:3])
+            if old is not None and desired_slots[key[:3]] == 1:
+                updated.append((old, key))
+                removed[old] -= 1
+                added[key] -= 1
+
+        return +removed, +added, updated, sum(unchanged.values())
 
     @staticmethod
     def build_self(connection: ApiRequests, domain: str) -> DNSes:
@@ -49,9 +149,13 @@ class DNSes:
 
 class DNS:
     """DNS model."""
-    def __init__(self, connection: ApiRequests, dns: dict):
+
+    __slots__ = ('_connection', 'domain', 'name', 'expire', 'type', 'content')
+
+    def __init__(self, connection: ApiRequests, dns: dict, domain: str = None):
         """DNS init."""
         self._connection = connection
+        self.domain = domain
         self.name = dns['name']
         self.expire = dns['expire']
         self.type = dns['type']
@@ -66,10 +170,25 @@ class DNS:
             'content': self.content
         }
 
-    def update(self):
-        """Update self."""
-        raise NotImplementedError('patch requests are for the next version, this is a placeholder')
+    def key(self) -> tuple:
+        """Identity of the record within a zone."""
+        return self.name, int(self.expire), self.type.upper(), self.content
+
+    @staticmethod
+    def from_key(connection: ApiRequests, key: tuple, domain: str = None) -> DNS:
+        name, expire, dtype, content = key
+        return DNS(connection, {'name': name, 'expire': expire, 'type': dtype, 'content': content}, domain)
+
+    def update(self) -> bool:
+        """Update content of self, the record is matched on name, expire and type."""
+        return self._connection.perform_patch_request(
+            f'/domains/{self.domain}/dns',
+            {'dnsEntry': self.serialize()}
+        )
 
-    def delete(self):
+    def delete(self) -> bool:
         """delete self."""
-        raise NotImplementedError('Delete request not implemented')
+        return self._connection.perform_delete_request(
+            f'/domains/{self.domain}/dns',
+            {'dnsEntry': self.serialize()}
+        )
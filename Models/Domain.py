@@ -1,13 +1,32 @@
 from __future__ import annotations
-from datetime import datetime
+from datetime import date, datetime
 
 from HttpLogic.RequestTypes import ApiRequests
-from Models import Branding, Contacts, DNSes, NameServers, SSL
+from Models.Branding import Branding
+from Models.Contacts import Contacts
+from Models.DNSes import DNSes
+from Models.NameServers import NameServers
+from Models.SSL import SSL
 
 
 class Domain:
     """Domain object."""
 
+    __slots__ = (
+        '_connection', 'name', 'auth_code', 'is_transfer_locked', 'registration_date', 'renewal_date',
+        'is_whitelabel', 'cancellation_date', 'cancellation_status', 'is_dns_only', 'tags', 'branding',
+        'contacts', 'dnses', 'name_servers', 'ssl_certificates'
+    )
+
+    includes = {
+        'branding': 'get_branding',
+        'contacts': 'get_contacts',
+        'dns': 'get_dnses',
+        'nameservers': 'get_name_servers',
+        'ssl': 'get_ssl_certificates'
+    }
+    server_includes = ['contacts', 'nameservers']
+
     def __init__(self, connection: ApiRequests, domain: dict):
         """Domain init."""
         self._connection = connection
@@ -16,14 +35,14 @@ class Domain:
             if 'authCode' in domain else None
         self.is_transfer_locked = bool(domain['isTransferLocked'])\
             if 'isTransferLocked' in domain else None
-        self.registration_date = datetime.strptime(domain['registrationDate'], '%Y-%m-%d').date()\
+        self.registration_date = date.fromisoformat(domain['registrationDate'])\
             if 'registrationDate' in domain else None
-        self.renewal_date = datetime.strptime(domain['renewalDate'], '%Y-%m-%d').date()\
+        self.renewal_date = date.fromisoformat(domain['renewalDate'])\
             if 'renewalDate' in domain else None
         self.is_whitelabel = bool(domain['isWhitelabel'])\
             if 'isWhitelabel' in domain else None
-        self.cancellation_date = datetime.strptime(domain['cancellationDate'], '%Y-%m-%d %H:%M:%S')\
-            if 'cancellationDate' in domain and domain['cancellationDate'] is not '' else None
+        self.cancellation_date = datetime.fromisoformat(domain['cancellationDate'])\
+            if 'cancellationDate' in domain and domain['cancellationDate'] != '' else None
         self.cancellation_status = domain['cancellationStatus']\
             if 'cancellationStatus' in domain else None
         self.is_dns_only = bool(domain['isDnsOnly'])\
@@ -34,10 +53,16 @@ class Domain:
             if 'branding' in domain else None
         self.contacts = domain['contacts']\
             if 'contacts' in domain else None
+        if isinstance(self.contacts, list):
+            self.contacts = Contacts(connection, self.contacts, self.name)
         self.dnses = domain['dnses']\
             if 'dnses' in domain else None
         self.name_servers = domain['nameservers']\
             if 'nameservers' in domain else None
+        if isinstance(self.name_servers, list):
+            self.name_servers = [
+                NameServers(connection, n) if isinstance(n, dict) else n for n in self.name_servers
+            ]
         self.ssl_certificates = domain['ssl']\
             if 'ssl' in domain else None
 
@@ -1,17 +1,23 @@
-from datetime import datetime
+from datetime import date
 
 from HttpLogic.RequestTypes import ApiRequests
 
 
 class Invoice:
     """Invoice model."""
+
+    __slots__ = (
+        '_connection', 'invoice_number', 'creation_date', 'pay_date', 'due_date', 'invoice_status',
+        'currency', 'total_amount', 'total_amount_incl_vat', 'invoice_items'
+    )
+
     def __init__(self, connection: ApiRequests, invoice: dict):
         """Invoice init."""
         self._connection = connection
         self.invoice_number = invoice['invoiceNumber']
-        self.creation_date = datetime.strptime(invoice['creationDate'], '%Y-%m-%d').date()
-        self.pay_date = datetime.strptime(invoice['payDate'], '%Y-%m-%d').date()
-        self.due_date = datetime.strptime(invoice['dueDate'], '%Y-%m-%d').date()
+        self.creation_date = date.fromisoformat(invoice['creationDate'])
+        self.pay_date = date.fromisoformat(invoice['payDate'])
+        self.due_date = date.fromisoformat(invoice['dueDate'])
         self.invoice_status = invoice['invoiceStatus']
         self.currency = invoice['currency']
         self.total_amount = invoice['totalAmount']
@@ -4,8 +4,18 @@ from HttpLogic.RequestTypes import ApiRequests
 class NameServers:
     """Nameservers model."""
 
+    __slots__ = ('_connection', 'hostname', 'ipv4', 'ipv6')
+
     def __init__(self, connection: ApiRequests, nameservers: dict):
         self._connection = connection
         self.hostname = nameservers['hostname']
         self.ipv4 = nameservers['ipv4']
         self.ipv6 = nameservers['ipv6']
+
+    def serialize(self) -> dict:
+        """Return self as dict."""
+        return {
+            'hostname': self.hostname,
+            'ipv4': self.ipv4,
+            'ipv6': self.ipv6
+        }
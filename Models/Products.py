@@ -4,6 +4,8 @@ from HttpLogic.RequestTypes import ApiRequests
 class Products:
     """Products Model."""
 
+    __slots__ = ('_connection', 'type', 'name', 'description', 'price', 'recurring_price', 'specifications')
+
     def __init__(self, connection: ApiRequests, product: dict):
         """Products init."""
         self._connection = connection
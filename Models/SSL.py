@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date
 
 from HttpLogic.RequestTypes import ApiRequests
 
@@ -6,10 +6,12 @@ from HttpLogic.RequestTypes import ApiRequests
 class SSL:
     """SSL model."""
 
+    __slots__ = ('_connection', 'certificate_id', 'common_name', 'expiration_date', 'status')
+
     def __init__(self, connection: ApiRequests, ssl: dict):
         """SSL init."""
         self._connection = connection
         self.certificate_id = ssl['certificateId']
         self.common_name = ssl['commonName']
-        self.expiration_date = datetime.strptime(ssl['expirationDate'], '%Y-%m-%d').date()
+        self.expiration_date = date.fromisoformat(ssl['expirationDate'])
         self.status = ssl['status']
@@ -0,0 +1,135 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+from TransIpRestfulAPI import TransIpRestfulAPI
+
+from Models import *
+
+
+class ProductCatalogue:
+    """All products with their elements, indexed for lookups without requests.
+
+    The products and the elements of every product are loaded once, the
+    elements on a pool of workers, on first use or by load(). With
+    background set the catalogue reloads itself every ttl seconds, a failed
+    reload is retried after retry_interval seconds and lookups keep
+    answering from the previous catalogue meanwhile.
+    """
+
+    def __init__(
+            self,
+            api: TransIpRestfulAPI,
+            ttl: float = 3600.0,
+            workers: int = 8,
+            background: bool = True,
+            retry_interval: float = 60.0
+    ):
+        self.api = api
+        self.ttl = ttl
+        self.workers = workers
+        self.background = background
+        self.retry_interval = retry_interval
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._timer = None
+        self._closed = False
+        # replaced as a whole on reload, lookups read it without locking
+        self._index = None
+
+    def load(self):
+        """Load products and elements now, return self."""
+        products = self.api.get_products()
+        with ThreadPoolExecutor(max_workers=max(self.workers, 1)) as executor:
+            for future in [executor.submit(product.get_elements) for product in products]:
+                future.result()
+
+        index = {'name': {}, 'type': {}, 'element': {}}
+        for product in products:
+            index['name'][product.name] = product
+            index['type'].setdefault(product.type, []).append(product)
+            for element in product.specifications:
+                index['element'].setdefault(element, []).append(product)
+
+        with self._lock:
+            self._index = index
+            self.loaded_at = time()
+
+        self._schedule(self.ttl)
+        return self
+
+    def close(self):
+        """Stop background reloads."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    # ### Lookups ### #
+
+    def get(self, name: str) -> Products:
+        """Product by name, raises KeyError for unknown products."""
+        return self._current()['name'][name]
+
+    def find(self, name: str, default=None):
+        return self._current()['name'].get(name, default)
+
+    def names(self) -> list:
+        return list(self._current()['name'])
+
+    def types(self) -> list:
+        return list(self._current()['type'])
+
+    def by_type(self, product_type: str) -> [Products]:
+        return list(self._current()['type'].get(product_type, []))
+
+    def with_element(self, element: str) -> [Products]:
+        """Products having an element with this name."""
+        return list(self._current()['element'].get(element, []))
+
+    def element(self, name: str, element: str) -> dict:
+        """Element of a product, raises KeyError when either is unknown."""
+        return self.get(name).specifications[element]
+
+    def age(self) -> float:
+        """Seconds since the catalogue was loaded, None before the first load."""
+        return None if self.loaded_at is None else time() - self.loaded_at
+
+    def _current(self) -> dict:
+        index = self._index
+        if index is None:
+            # concurrent first lookups wait for a single load
+            with self._load_lock:
+                if self._index is None:
+                    self.load()
+
+            index = self._index
+
+        return index
+
+    # ### Background reload ### #
+
+    def _schedule(self, delay: float):
+        if not self.background:
+            return
+
+        with self._lock:
+            if self._closed:
+                return
+
+            if self._timer is not None:
+                self._timer.cancel()
+
+            self._timer = threading.Timer(delay, self._reload)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _reload(self):
+        try:
+            self.load()
+        except Exception:
+            # keep answering from the loaded catalogue
+            self._schedule(self.retry_interval)
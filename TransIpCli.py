@@ -0,0 +1,147 @@
+"""Command line interface, `transip --help` for usage.
+
+Credentials are read from --login and --key or the TRANSIP_LOGIN and
+TRANSIP_KEY_FILE environment variables, the key may also be given as PEM
+data in TRANSIP_PRIVATE_KEY. The api is only imported once a command runs,
+so `--help` and argument errors return without loading requests or
+cryptography.
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def _api(arguments, read_only: bool = True):
+    from TransIpRestfulAPI import TransIpRestfulAPI
+
+    if arguments.login is None:
+        raise SystemExit('transip: no login, pass --login or set TRANSIP_LOGIN')
+
+    key = arguments.key
+    if key is None:
+        from HttpLogic.Authenticate import TransIpAuthenticate
+        try:
+            key = TransIpAuthenticate.key_from_env()
+        except ValueError:
+            raise SystemExit('transip: no private key, pass --key or set TRANSIP_KEY_FILE or TRANSIP_PRIVATE_KEY')
+
+    api = TransIpRestfulAPI(arguments.login, key)
+    api.auth.set_read_only(read_only)
+    return api
+
+
+def test(arguments) -> int:
+    api = _api(arguments)
+    try:
+        connected = api.test_connection()
+    finally:
+        api.close()
+
+    print('ok' if connected else 'failed')
+    return 0 if connected else 1
+
+
+def domains_list(arguments) -> int:
+    api = _api(arguments)
+    try:
+        for domain in api.iter_domains(arguments.tag or None):
+            if arguments.json:
+                print(json.dumps({
+                    'name': domain.name,
+                    'renewalDate': None if domain.renewal_date is None else domain.renewal_date.isoformat(),
+                    'tags': domain.tags or []
+                }))
+            else:
+                renewal = '' if domain.renewal_date is None else domain.renewal_date.isoformat()
+                print(f"{domain.name}\t{renewal}\t{','.join(domain.tags or [])}")
+    finally:
+        api.close()
+
+    return 0
+
+
+def dns_sync(arguments) -> int:
+    from Models.DNSes import DNS, DNSes
+
+    if arguments.records == '-':
+        records = json.load(sys.stdin)
+    else:
+        with open(arguments.records) as records_file:
+            records = json.load(records_file)
+
+    if isinstance(records, dict):
+        records = records['dnsEntries']
+
+    api = _api(arguments, read_only=arguments.dry_run)
+    try:
+        zone = api.get_dns_for_domain(arguments.domain)
+        if arguments.dry_run:
+            removed, added, updated, unchanged = DNSes.diff(
+                [dns.key() for dns in zone.dnses],
+                [DNS(None, record).key() for record in records]
+            )
+            removed, added = list(removed.elements()), list(added.elements())
+            changes = len(removed) + len(added) + len(updated)
+            if changes == 0:
+                method = None
+            elif arguments.strategy == 'put' or arguments.strategy == 'auto' and changes > 1:
+                method = 'put'
+            else:
+                method = 'incremental'
+        else:
+            report = zone.sync(records, arguments.strategy)
+            removed = [dns.key() for dns in report['removed']]
+            added = [dns.key() for dns in report['added']]
+            updated = [(old.key(), new.key()) for old, new in report['updated']]
+            unchanged, method = report['unchanged'], report['method']
+    finally:
+        api.close()
+
+    for name, expire, dtype, content in added:
+        print(f'+ {name} {expire} {dtype} {content}')
+    for name, expire, dtype, content in removed:
+        print(f'- {name} {expire} {dtype} {content}')
+    for (name, expire, dtype, content), new in updated:
+        print(f'~ {name} {expire} {dtype} {content} -> {new[3]}')
+
+    print(f"{unchanged} unchanged, method: {method or 'none'}")
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    root = argparse.ArgumentParser(prog='transip', description='TransIP v6 API command line client.')
+    root.add_argument('--login', default=os.environ.get('TRANSIP_LOGIN'))
+    root.add_argument('--key', default=os.environ.get('TRANSIP_KEY_FILE'), help='path to the private key')
+    commands = root.add_subparsers(dest='command')
+    commands.required = True
+
+    command = commands.add_parser('test', help='test the connection to the api')
+    command.set_defaults(handler=test)
+
+    domains = commands.add_parser('domains', help='domain commands').add_subparsers(dest='action')
+    domains.required = True
+    command = domains.add_parser('list', help='list domains with their renewal date and tags')
+    command.add_argument('--tag', action='append', help='only domains with this tag, may be repeated')
+    command.add_argument('--json', action='store_true', help='print one json object per line')
+    command.set_defaults(handler=domains_list)
+
+    dns = commands.add_parser('dns', help='dns commands').add_subparsers(dest='action')
+    dns.required = True
+    command = dns.add_parser('sync', help='make the zone of a domain equal to a json file of records')
+    command.add_argument('domain')
+    command.add_argument('records', help='json list of name, expire, type and content records, - for stdin')
+    command.add_argument('--strategy', choices=['auto', 'put', 'incremental'], default='auto')
+    command.add_argument('--dry-run', action='store_true', help='only print the changes')
+    command.set_defaults(handler=dns_sync)
+
+    return root
+
+
+def main(argv: list = None) -> int:
+    arguments = parser().parse_args(argv)
+    return arguments.handler(arguments)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
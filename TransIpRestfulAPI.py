@@ -1,19 +1,66 @@
+import hashlib
+import heapq
+import os
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
 from HttpLogic.Authenticate import TransIpAuthenticate
 from HttpLogic.RequestTypes import ApiRequests
+from HttpLogic.Cache import ResponseCache
 from HttpLogic.Exceptions import NotFoundError
+from HttpLogic.Instrumentation import Instrumentation
+from HttpLogic.Scheduler import RequestScheduler
+from HttpLogic.Session import ConnectionPool
+from HttpLogic.Streaming import Base64FieldWriter
+from HttpLogic.TokenStore import TokenStore
 
 from Models import *
+from Models.DNSes import DNS
 
 
 class TransIpRestfulAPI:
 
+    scheme = 'https'
     endpoint = 'api.transip.nl'
     version = 'v6'
 
-    def __init__(self, login: str, key_url: str):
-        """Set Api with credentials."""
-        self.auth = TransIpAuthenticate(login, key_url, self.get_endpoint())
-        self.requests = ApiRequests(self.auth, self.get_endpoint())
+    def __init__(
+            self,
+            login: str,
+            key_url: str,
+            session: ConnectionPool = None,
+            cache: ResponseCache = None,
+            instrumentation: Instrumentation = None,
+            token_store: TokenStore = None,
+            scheduler: RequestScheduler = None
+    ):
+        """Set Api with credentials, pass a MemoryCache or SqliteCache to cache slow changing endpoints.
+
+        Pass a FileTokenStore or SqliteTokenStore to share tokens between processes.
+        """
+        self.session = session if session is not None else ConnectionPool()
+        self.instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+        self.auth = TransIpAuthenticate(
+            login,
+            key_url,
+            self.get_endpoint(),
+            self.session,
+            self.instrumentation,
+            token_store
+        )
+        self.requests = ApiRequests(
+            self.auth,
+            self.get_endpoint(),
+            self.session,
+            cache,
+            scheduler,
+            self.instrumentation
+        )
+
+    def close(self):
+        self.auth.close()
+        self.session.close()
 
     # ### Get requests ### #
 
@@ -26,21 +73,47 @@ class TransIpRestfulAPI:
     def get_branding_for_domain(self, domain: str) -> Branding:
         return Branding.build_self(self.requests, domain)
 
+    def get_connection_stats(self) -> dict:
+        return self.session.stats()
+
+    def get_scheduler_stats(self) -> dict:
+        return self.requests.scheduler.stats()
+
     def get_contacts_for_domain(self, domain: str) -> Contacts:
         return Contacts.build_self(self.requests, domain)
 
     def get_dns_for_domain(self, domain: str) -> DNSes:
         return DNSes.build_self(self.requests, domain)
 
-    def get_domains(self, tags: list = None) -> list:
-        tag = '' if tags is None or len(tags) == 0 else '?tags=' ','.join(tags)
+    def get_domains(
+            self,
+            tags: list = None,
+            include: list = None,
+            workers: int = 8,
+            page: int = None,
+            page_size: int = None
+    ) -> list:
+        """Get domains filtered on tags by the API.
+
+        Includes the API can embed (see Domain.server_includes) are requested
+        with the listing, the others are fetched on a pool of workers.
+        """
+        include = [] if include is None else list(include)
+        unknown = [name for name in include if name not in Domain.includes]
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown include: {', '.join(unknown)}")
 
-        request = f'/domains{tag}'
+        server_side = [name for name in include if name in Domain.server_includes]
+        query = ApiRequests.build_query({'tags': tags, 'include': server_side, 'page': page, 'pageSize': page_size})
         response = self.requests.perform_get_request(
-            request,
+            f'/domains{query}',
             lambda data: [Domain(self.requests, domain) for domain in data['domains']]
         )
 
+        client_side = [name for name in include if name not in server_side]
+        if client_side:
+            self.hydrate_domains(response, client_side, workers)
+
         return response
 
     def get_domain(self, domain_name: str) -> Domain:
@@ -51,7 +124,7 @@ class TransIpRestfulAPI:
         )
 
     def get_endpoint(self) -> str:
-        return f'https://{self.endpoint}/{self.version}'
+        return f'{self.scheme}://{self.endpoint}/{self.version}'
 
     def get_invoice(self, invoice_number: str) -> Invoice:
         request = f'/invoices/{invoice_number}'
@@ -73,6 +146,63 @@ class TransIpRestfulAPI:
             lambda data: data['pdf']
         )
 
+    def download_invoice_pdf(self, invoice_number: str, path: str, skip_existing: bool = True) -> str:
+        """Stream invoice pdf to path, returns `downloaded` or `skipped`.
+
+        A `<path>.sha256` file is written next to the pdf, an existing pdf
+        matching it is not downloaded again.
+        """
+        checksum_path = f'{path}.sha256'
+        if skip_existing and self._file_matches_checksum(path, checksum_path):
+            return 'skipped'
+
+        partial_path = f'{path}.part'
+        try:
+            with open(partial_path, 'wb') as pdf:
+                writer = Base64FieldWriter('pdf', pdf)
+                self.requests.perform_stream_request(f'/invoices/{invoice_number}/pdf', writer.feed)
+                writer.close()
+
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        with open(checksum_path, 'w') as checksum:
+            checksum.write(writer.sha256.hexdigest())
+
+        return 'downloaded'
+
+    def download_invoices(self, invoice_numbers: list, directory: str, workers: int = 4) -> list:
+        """Download invoice pdfs concurrently, returns one report per invoice."""
+        os.makedirs(directory, exist_ok=True)
+
+        def download(invoice_number: str) -> dict:
+            path = os.path.join(directory, f'{invoice_number}.pdf')
+            try:
+                status = self.download_invoice_pdf(invoice_number, path)
+                return {'invoice_number': invoice_number, 'path': path, 'status': status, 'error': None}
+            except Exception as error:
+                return {'invoice_number': invoice_number, 'path': path, 'status': 'failed', 'error': error}
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            return list(executor.map(download, invoice_numbers))
+
+    @staticmethod
+    def _file_matches_checksum(path: str, checksum_path: str) -> bool:
+        if not os.path.exists(path) or not os.path.exists(checksum_path):
+            return False
+
+        with open(checksum_path, 'r') as checksum:
+            expected = checksum.read().strip()
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as pdf:
+            for block in iter(lambda: pdf.read(64 * 1024), b''):
+                digest.update(block)
+
+        return digest.hexdigest() == expected
+
     def get_products(self) -> [Products]:
         return self.requests.perform_get_request(
             '/products',
@@ -82,10 +212,140 @@ class TransIpRestfulAPI:
             ]
         )
 
+    def get_single_flight_stats(self) -> dict:
+        return self.requests.single_flight.stats()
+
     def get_ssl_certificates_for_domain(self, domain: str) -> [SSL]:
         domain = Domain(self.requests, {'name': domain})
         return domain.get_ssl_certificates()
 
+    def hydrate_domains(self, domains: [Domain], include: list, workers: int = 8, on_error=None) -> [Domain]:
+        """Fetch the included sub resources of all domains on a thread pool.
+
+        The first failure is raised, unless on_error is given, then
+        on_error(domain, error) is called for every failing fetch and the
+        other domains are still hydrated.
+        """
+        unknown = [name for name in include if name not in Domain.includes]
+        if len(unknown) > 0:
+            raise ValueError(f"Unknown include: {', '.join(unknown)}")
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            futures = [
+                (domain, executor.submit(getattr(domain, Domain.includes[name])))
+                for domain in domains for name in include
+            ]
+            for domain, future in futures:
+                try:
+                    future.result()
+                except Exception as error:
+                    if on_error is None:
+                        raise
+
+                    on_error(domain, error)
+
+        return domains
+
+    def iter_domains(self, tags: list = None, page_size: int = 100, prefetch: bool = True, include: list = None):
+        """Yield domains page by page, include only accepts Domain.server_includes."""
+        unknown = [name for name in include or [] if name not in Domain.server_includes]
+        if len(unknown) > 0:
+            raise ValueError(f"Include not supported while iterating: {', '.join(unknown)}")
+
+        params = {'tags': tags, 'include': include}
+        for domain in self._iter_pages('/domains', params, 'domains', page_size, prefetch):
+            yield Domain(self.requests, domain)
+
+    def iter_invoices(self, page_size: int = 100, prefetch: bool = True):
+        """Yield invoices page by page."""
+        for invoice in self._iter_pages('/invoices', {}, 'invoices', page_size, prefetch):
+            yield Invoice(self.requests, invoice)
+
+    def _iter_pages(self, request: str, params: dict, key: str, page_size: int, prefetch: bool):
+        """Yield raw items of a list endpoint, requesting the next page while the current is consumed."""
+        def fetch(page: int) -> list:
+            query = ApiRequests.build_query({**params, 'page': page, 'pageSize': page_size})
+            return self.requests.perform_get_request(
+                f'{request}{query}',
+                lambda data: data[key]
+            )
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = 1
+            items = fetch(page)
+            while True:
+                last_page = len(items) < page_size
+                upcoming = executor.submit(fetch, page + 1) if executor is not None and not last_page else None
+
+                yield from items
+
+                if last_page:
+                    return
+
+                page += 1
+                items = upcoming.result() if upcoming is not None else fetch(page)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def scan_ssl_expiry(self, within_days: int = 30, tags: list = None, workers: int = 8, on_error=None):
+        """Yield (domain name, SSL) for certificates expiring within within_days.
+
+        Certificates that already expired are yielded as soon as their domain
+        is fetched, the others follow soonest expiring first once all domains
+        are done. Certificates are fetched on a pool of workers while the
+        domains are listed page by page, with at most workers * 2 domains in
+        flight. Domains that fail are skipped and passed to on_error(name, error).
+        """
+        today = date.today()
+        before = today + timedelta(days=within_days)
+        workers = max(workers, 1)
+        expiring = []
+
+        def fetch(domain: Domain) -> tuple:
+            return domain.name, domain.get_ssl_certificates()
+
+        def collect(futures) -> list:
+            """Expired certificates of the finished futures, the others go onto the heap."""
+            expired = []
+            for future in futures:
+                try:
+                    name, certificates = future.result()
+                except Exception as error:
+                    if on_error is not None:
+                        on_error(domains[future], error)
+                    continue
+
+                for ssl in certificates:
+                    if ssl.expiration_date < today:
+                        expired.append((name, ssl))
+                    elif ssl.expiration_date <= before:
+                        heapq.heappush(expiring, (ssl.expiration_date, name, ssl.certificate_id, ssl))
+
+            return expired
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            domains = {}
+            for domain in self.iter_domains(tags):
+                if len(domains) >= workers * 2:
+                    done, _ = wait(domains, return_when=FIRST_COMPLETED)
+                    yield from collect(done)
+                    for future in done:
+                        del domains[future]
+
+                domains[executor.submit(fetch, domain)] = domain.name
+
+            while domains:
+                done, _ = wait(domains, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+                for future in done:
+                    del domains[future]
+
+        while expiring:
+            _, name, _, ssl = heapq.heappop(expiring)
+            yield name, ssl
+
     def test_connection(self) -> bool:
         return self.requests.perform_get_request(
             '/api-test',
@@ -101,8 +361,8 @@ class TransIpRestfulAPI:
             name_servers: [NameServers] = None,
             dnses: DNSes = None,
             update_model: bool = True
-    ):
-        self.transfer_domain(
+    ) -> Domain:
+        return self.transfer_domain(
             domain_name,
             '',
             contacts,
@@ -111,6 +371,14 @@ class TransIpRestfulAPI:
             update_model
         )
 
+    def create_domains(self, domains: list, workers: int = 8, update_model: bool = True) -> list:
+        """Register domains, given as names or dicts of create_domain arguments, see transfer_domains."""
+        return self.transfer_domains(
+            [{'domain_name': domain} if isinstance(domain, str) else domain for domain in domains],
+            workers,
+            update_model
+        )
+
     def create_dns_entry_for_domain(
             self,
             domain: str,
@@ -122,6 +390,39 @@ class TransIpRestfulAPI:
         domain = Domain(self.requests, {'name': domain})
         domain.add_dns_entry(name, expire, dtype.upper(), content)
 
+    def create_dns_entries(self, operations: list, workers: int = 8) -> list:
+        """Add (domain, record) pairs, domains in parallel and records of one domain in order.
+
+        Returns one report per operation, in the given order, with the
+        exception of failed operations instead of raising it.
+        """
+        by_domain = {}
+        for index, (domain, record) in enumerate(operations):
+            by_domain.setdefault(domain, []).append(index)
+
+        reports = [
+            {'domain': domain, 'record': record, 'success': False, 'error': None}
+            for domain, record in operations
+        ]
+
+        def add_entries(domain: str, indexes: list):
+            dnses = DNSes(self.requests, [], domain)
+            for index in indexes:
+                record = reports[index]['record']
+                try:
+                    record = record.serialize() if isinstance(record, DNS) else dict(record)
+                    record['type'] = record['type'].upper()
+                    dnses.add_dns(record)
+                    reports[index]['success'] = True
+                except Exception as error:
+                    reports[index]['error'] = error
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            for future in [executor.submit(add_entries, domain, indexes) for domain, indexes in by_domain.items()]:
+                future.result()
+
+        return reports
+
     def transfer_domain(
             self,
             domain_name: str,
@@ -130,20 +431,10 @@ class TransIpRestfulAPI:
             name_servers: [NameServers] = None,
             dnses: DNSes = None,
             update_model: bool = True
-    ):
-        domain = {
-            'name': domain_name,
-            'contacts': [] if contacts is None else contacts,
-            'nameservers': [] if name_servers is None else name_servers,
-            'dnses': [] if dnses is None else dnses
-        }
-
-        if transfer_code is not None and transfer_code is not '':
-            domain['authCode'] = transfer_code
-
+    ) -> Domain:
         self.requests.perform_post_request(
             '/domains',
-            domain
+            self._domain_body(domain_name, transfer_code, contacts, name_servers, dnses)
         )
         if update_model:
             try:
@@ -151,4 +442,74 @@ class TransIpRestfulAPI:
             except NotFoundError:
                 pass
 
-        return Domain(self.requests, {'name': domain_name})
\ No newline at end of file
+        return Domain(self.requests, {'name': domain_name})
+
+    def transfer_domains(self, transfers: list, workers: int = 8, update_model: bool = True) -> list:
+        """Register or transfer domains, given as dicts of transfer_domain arguments.
+
+        The POSTs run on a pool of workers, afterwards the new domains are
+        read from a single domain listing instead of one GET per domain.
+        Returns one report per domain, in the given order, with the exception
+        of failed domains instead of raising it.
+        """
+        reports = [
+            {'domain': transfer['domain_name'], 'success': False, 'error': None, 'result': None}
+            for transfer in transfers
+        ]
+
+        def post(report: dict, transfer: dict):
+            try:
+                self.requests.perform_post_request('/domains', self._domain_body(
+                    transfer['domain_name'],
+                    transfer.get('transfer_code'),
+                    transfer.get('contacts'),
+                    transfer.get('name_servers'),
+                    transfer.get('dnses')
+                ))
+                report['success'] = True
+            except Exception as error:
+                report['error'] = error
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            for future in [executor.submit(post, report, transfer) for report, transfer in zip(reports, transfers)]:
+                future.result()
+
+        listed = {}
+        if update_model and any(report['success'] for report in reports):
+            listed = {domain.name: domain for domain in self.get_domains()}
+
+        for report in reports:
+            if report['success']:
+                report['result'] = listed.get(report['domain'], Domain(self.requests, {'name': report['domain']}))
+
+        return reports
+
+    @staticmethod
+    def _domain_body(
+            domain_name: str,
+            transfer_code: str = None,
+            contacts: [Contacts] = None,
+            name_servers: [NameServers] = None,
+            dnses: DNSes = None
+    ) -> dict:
+        def serialize(value) -> list:
+            """Models to their json form, collections through _serialize and items through serialize."""
+            if value is None:
+                return []
+
+            if hasattr(value, '_serialize'):
+                return value._serialize()
+
+            return [item.serialize() if hasattr(item, 'serialize') else item for item in value]
+
+        domain = {
+            'name': domain_name,
+            'contacts': serialize(contacts),
+            'nameservers': serialize(name_servers),
+            'dnses': serialize(dnses)
+        }
+
+        if transfer_code is not None and transfer_code != '':
+            domain['authCode'] = transfer_code
+
+        return domain
@@ -0,0 +1,346 @@
+"""In process fake of the TransIP v6 API for benchmarks and local experiments.
+
+    server = FakeTransIpServer(domains=500, latency=0.01).start()
+    api = server.client()
+    ...
+    server.stop()
+"""
+import base64
+import json
+import math
+import random
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep, time
+from urllib.parse import parse_qs, urlsplit
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from AsyncTransIpRestfulAPI import AsyncTransIpRestfulAPI
+from HttpLogic.Scheduler import RequestScheduler
+from TransIpRestfulAPI import TransIpRestfulAPI
+
+
+class FakeTransIpServer:
+    """Threaded http server answering the TransIP v6 endpoints used by this package.
+
+    latency is added to every request, error_rate is the chance of a 500
+    response on any endpoint but /auth and rate_limit the amount of requests allowed per
+    rate_limit_window seconds, reported through the X-Rate-Limit-* headers.
+    """
+
+    def __init__(
+            self,
+            domains: int = 100,
+            dns_entries: int = 10,
+            invoices: int = 50,
+            latency: float = 0.0,
+            error_rate: float = 0.0,
+            rate_limit: int = None,
+            rate_limit_window: float = 60.0,
+            seed: int = 1
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time()
+        self._window_requests = 0
+        self._httpd = None
+        self._build_data(domains, dns_entries, invoices)
+
+    def _build_data(self, domains: int, dns_entries: int, invoices: int):
+        self.domains = {}
+        self.dns = {}
+        for i in range(domains):
+            name = f'example-{i}.nl'
+            self.domains[name] = {
+                'name': name,
+                'authCode': 'kJqfuOXNOYQKqh/jO4bYSn54YDqgAt1ksCe+ZG4Ud8nC8CxNd+shfz7yr',
+                'isTransferLocked': False,
+                'registrationDate': '2016-01-01',
+                'renewalDate': f'2027-{i % 12 + 1:02d}-01',
+                'isWhitelabel': False,
+                'cancellationDate': '',
+                'cancellationStatus': '',
+                'isDnsOnly': False,
+                'tags': ['even' if i % 2 == 0 else 'odd']
+            }
+            self.dns[name] = [
+                {'name': f'www{j}', 'expire': 86400, 'type': 'A', 'content': f'10.0.{i % 256}.{j % 256}'}
+                for j in range(dns_entries)
+            ]
+
+        self.invoices = {
+            f'F{i:07d}': {
+                'invoiceNumber': f'F{i:07d}',
+                'creationDate': '2020-01-01',
+                'payDate': '2020-01-15',
+                'dueDate': '2020-01-31',
+                'invoiceStatus': 'paid',
+                'currency': 'EUR',
+                'totalAmount': 1000,
+                'totalAmountInclVat': 1210
+            }
+            for i in range(invoices)
+        }
+        self.products = {
+            'domain': [{'name': 'nl', 'description': '.nl domain', 'price': 499, 'recurringPrice': 499}],
+            'vps': [
+                {'name': f'vps-bladevps-x{i}', 'description': f'vps {i}', 'price': 1000 * i, 'recurringPrice': 1000 * i}
+                for i in range(1, 9)
+            ]
+        }
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'{host}:{port}'
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _handler(self))
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def client(self, login: str = 'benchmark', key=None, throttle: bool = False, **kwargs) -> TransIpRestfulAPI:
+        """TransIpRestfulAPI pointed at this server, without client side rate limiting unless throttle is set."""
+        if key is None:
+            key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+        api = self._api_class()(login, key, **kwargs)
+        if not throttle:
+            api.requests.scheduler = RequestScheduler(rate=float('inf'), burst=2 ** 31)
+
+        return api
+
+    def async_client(self, login: str = 'benchmark', key=None, throttle: bool = False, **kwargs) -> AsyncTransIpRestfulAPI:
+        """AsyncTransIpRestfulAPI pointed at this server, see client()."""
+        if key is None:
+            key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+        async_class = type('FakeAsyncTransIpRestfulAPI', (AsyncTransIpRestfulAPI,), {'api_class': self._api_class()})
+        api = async_class(login, key, **kwargs)
+        if not throttle:
+            api.api.requests.scheduler = RequestScheduler(rate=float('inf'), burst=2 ** 31)
+
+        return api
+
+    def _api_class(self) -> type:
+        return type('FakeTransIpRestfulAPI', (TransIpRestfulAPI,), {'scheme': 'http', 'endpoint': self.endpoint})
+
+    def _rate_limit_headers(self) -> tuple:
+        """Count request, return (limited, headers)."""
+        with self._lock:
+            self.requests += 1
+            if self.rate_limit is None:
+                return False, {}
+
+            now = time()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start = now
+                self._window_requests = 0
+
+            self._window_requests += 1
+            remaining = max(self.rate_limit - self._window_requests, 0)
+            headers = {
+                'X-Rate-Limit-Limit': str(self.rate_limit),
+                'X-Rate-Limit-Remaining': str(remaining),
+                'X-Rate-Limit-Reset': str(math.ceil(self._window_start + self.rate_limit_window))
+            }
+            return self._window_requests > self.rate_limit, headers
+
+    def _failed(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def handle(self, method: str, path: str, query: dict, body) -> tuple:
+        """Return (status, body) for a request."""
+        segments = path.strip('/').split('/')[1:]  # drop version
+        if len(segments) == 0:
+            return 404, {'error': f'{path} not found'}
+
+        if segments == ['auth'] and method == 'POST':
+            return 201, {'token': base64.b64encode(json.dumps({'login': body['login']}).encode()).decode()}
+
+        if segments == ['api-test']:
+            return 200, {'ping': 'pong'}
+
+        if segments == ['availability-zones']:
+            return 200, {'availability-zones': [{'name': 'ams0', 'country': 'nl', 'isDefault': True}]}
+
+        if segments == ['products']:
+            return 200, {'products': self.products}
+
+        if len(segments) == 3 and segments[0] == 'products' and segments[2] == 'elements':
+            return 200, {'productElements': [{'name': 'ipv4Addresses', 'description': 'ipv4', 'amount': 1}]}
+
+        if segments[0] == 'invoices':
+            return self._invoices(segments[1:], query)
+
+        if segments[0] == 'domains':
+            return self._domains(method, segments[1:], query, body)
+
+        return 404, {'error': f'{path} not found'}
+
+    def _invoices(self, segments: list, query: dict) -> tuple:
+        if len(segments) == 0:
+            return 200, {'invoices': self._page(list(self.invoices.values()), query)}
+
+        invoice = self.invoices.get(segments[0])
+        if invoice is None:
+            return 404, {'error': 'Invoice not found'}
+
+        if len(segments) == 1:
+            return 200, {'invoice': invoice}
+
+        if segments[1] == 'pdf':
+            return 200, {'pdf': base64.b64encode(b'%PDF-1.4 ' + invoice['invoiceNumber'].encode() * 4096).decode()}
+
+        return 200, {'invoiceItems': [{'product': 'nl', 'quantity': 1, 'price': 1000}]}
+
+    def _domains(self, method: str, segments: list, query: dict, body) -> tuple:
+        if len(segments) == 0:
+            if method == 'POST':
+                self.domains[body['name']] = {'name': body['name'], 'tags': []}
+                self.dns[body['name']] = list(body.get('dnses', []))
+                return 201, {}
+
+            domains = list(self.domains.values())
+            if 'tags' in query:
+                tags = set(query['tags'][0].split(','))
+                domains = [domain for domain in domains if tags & set(domain['tags'])]
+
+            if 'include' in query:
+                include = query['include'][0].split(',')
+                domains = [self._include(domain, include) for domain in domains]
+
+            return 200, {'domains': self._page(domains, query)}
+
+        name = segments[0]
+        if name not in self.domains:
+            return 404, {'error': f'Domain {name} not found'}
+
+        if len(segments) == 1:
+            return 200, {'domain': self.domains[name]}
+
+        resource = segments[1]
+        if resource == 'dns':
+            return self._dns(method, name, body)
+
+        if resource == 'nameservers':
+            return 200, {'nameservers': self._name_servers()}
+
+        if resource == 'contacts':
+            return 200, {'contacts': []}
+
+        if resource == 'ssl':
+            return 200, {'certificates': [
+                {'certificateId': 1, 'commonName': name, 'expirationDate': self.domains[name]['renewalDate'], 'status': 'active'}
+            ]}
+
+        if resource == 'branding':
+            return 200, {'branding': {
+                'companyName': 'Example', 'supportEmail': 'support@example.nl', 'companyUrl': 'example.nl',
+                'termsOfUsageUrl': '', 'bannerLine1': '', 'bannerLine2': '', 'bannerLine3': ''
+            }}
+
+        return 404, {'error': f'{resource} not found'}
+
+    def _include(self, domain: dict, include: list) -> dict:
+        domain = dict(domain)
+        if 'nameservers' in include:
+            domain['nameservers'] = self._name_servers()
+        if 'contacts' in include:
+            domain['contacts'] = []
+
+        return domain
+
+    @staticmethod
+    def _name_servers() -> list:
+        return [{'hostname': f'ns{i}.transip.net', 'ipv4': '', 'ipv6': ''} for i in range(3)]
+
+    def _dns(self, method: str, name: str, body) -> tuple:
+        with self._lock:
+            entries = self.dns[name]
+            if method == 'GET':
+                return 200, {'dnsEntries': list(entries)}
+
+            if method == 'PUT':
+                self.dns[name] = list(body['dnsEntries'])
+                return 204, None
+
+            entry = body['dnsEntry']
+            if method == 'POST':
+                entries.append(entry)
+                return 201, None
+
+            slot = (entry['name'], entry['expire'], entry['type'])
+            matches = [i for i, e in enumerate(entries) if (e['name'], e['expire'], e['type']) == slot]
+            if method == 'DELETE':
+                matches = [i for i in matches if entries[i]['content'] == entry['content']]
+
+            if len(matches) == 0:
+                return 404, {'error': 'Dns entry not found'}
+
+            if method == 'PATCH':
+                entries[matches[0]] = entry
+            else:
+                del entries[matches[0]]
+
+            return 204, None
+
+    @staticmethod
+    def _page(items: list, query: dict) -> list:
+        if 'page' not in query:
+            return items
+
+        size = int(query.get('pageSize', ['25'])[0])
+        page = int(query['page'][0])
+        return items[(page - 1) * size:page * size]
+
+
+def _handler(server: FakeTransIpServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+        wbufsize = 64 * 1024
+
+        def log_message(self, *args):
+            pass
+
+        def _respond(self):
+            length = int(self.headers.get('Content-Length', 0))
+            raw = self.rfile.read(length) if length else b''
+            if server.latency:
+                sleep(server.latency)
+
+            limited, headers = server._rate_limit_headers()
+            if limited:
+                status, body = 429, {'error': 'Rate limit exceeded'}
+            elif server._failed() and not self.path.endswith('/auth'):
+                status, body = 500, {'error': 'Injected failure'}
+            else:
+                url = urlsplit(self.path)
+                status, body = server.handle(self.command, url.path, parse_qs(url.query), json.loads(raw) if raw else None)
+
+            content = b'' if body is None else json.dumps(body).encode()
+            self.send_response(status)
+            for header, value in headers.items():
+                self.send_header(header, value)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    return Handler
@@ -0,0 +1,33 @@
+"""Parse time per MB of large /domains and /domains/{d}/dns bodies for each json backend.
+
+    python -m benchmarks.json_parsing [domains] [dns_entries]
+"""
+import json
+import sys
+
+from timeit import repeat
+
+from HttpLogic import JsonBackend
+from benchmarks.models import _dns, _domain
+
+
+def payloads(domains: int, dns_entries: int) -> dict:
+    return {
+        '/domains': json.dumps({'domains': [_domain(i) for i in range(domains)]}).encode('utf-8'),
+        '/domains/{d}/dns': json.dumps({'dnsEntries': [_dns(i) for i in range(dns_entries)]}).encode('utf-8'),
+    }
+
+
+def main(domains: int = 20000, dns_entries: int = 50000):
+    bodies = payloads(int(domains), int(dns_entries))
+    for url, body in bodies.items():
+        megabytes = len(body) / 1024 / 1024
+        print(f'{url}: {megabytes:.1f} MB')
+        print(f"  {'decode + json':13} {min(repeat(lambda: json.loads(body.decode()), number=1, repeat=5)) / megabytes * 1000:8.2f} ms/MB")
+        for name, loads in JsonBackend.backends.items():
+            seconds = min(repeat(lambda: loads(body), number=1, repeat=5))
+            print(f'  {name:13} {seconds / megabytes * 1000:8.2f} ms/MB')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
@@ -0,0 +1,59 @@
+"""Build time and peak memory of large model listings.
+
+    python -m benchmarks.models [count]
+"""
+import sys
+import tracemalloc
+
+from time import perf_counter
+
+from Models import Domain
+from Models.DNSes import DNS
+
+
+def _domain(i: int) -> dict:
+    return {
+        'name': f'example-{i}.nl',
+        'authCode': 'kJqfuOXNOYQKqh/jO4bYSn54YDqgAt1ksCe+ZG4Ud8nC8CxNd+shfz7yr',
+        'isTransferLocked': False,
+        'registrationDate': '2016-01-01',
+        'renewalDate': '2020-01-01',
+        'isWhitelabel': False,
+        'cancellationDate': '2020-01-01 12:00:00',
+        'cancellationStatus': 'signed',
+        'isDnsOnly': False,
+        'tags': ['customTag', 'anotherTag']
+    }
+
+
+def _dns(i: int) -> dict:
+    return {'name': f'www{i}', 'expire': 86400, 'type': 'A', 'content': '127.0.0.1'}
+
+
+def measure(build, payloads: list) -> tuple:
+    """Time a plain run, then trace a second run for memory."""
+    start = perf_counter()
+    models = [build(payload) for payload in payloads]
+    elapsed = perf_counter() - start
+    del models
+
+    tracemalloc.start()
+    models = [build(payload) for payload in payloads]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models
+    return elapsed, peak
+
+
+def main(count: int = 100000):
+    count = int(count)
+    for name, build, payloads in [
+        ('Domain', lambda d: Domain(None, d), [_domain(i) for i in range(count)]),
+        ('DNS', lambda d: DNS(None, d), [_dns(i) for i in range(count)]),
+    ]:
+        elapsed, peak = measure(build, payloads)
+        print(f'{count} x {name}: {elapsed:.3f} s, peak {peak / 1024 / 1024:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
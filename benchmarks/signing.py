@@ -0,0 +1,46 @@
+"""Signing cost per token request.
+
+    python -m benchmarks.signing [path/to/key.pem]
+"""
+import sys
+
+from timeit import timeit
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from HttpLogic.Authenticate import TransIpAuthenticate
+
+
+def _pem(path: str = None) -> bytes:
+    if path is not None:
+        with open(path, 'rb') as key_file:
+            return key_file.read()
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+
+
+def main(path: str = None, number: int = 200):
+    pem = _pem(path)
+    auth = TransIpAuthenticate('benchmark', pem, 'http://localhost')
+    body = auth._get_request_body(True, False)
+    key = auth._private_key
+
+    parse_and_sign = timeit(
+        lambda: auth._create_signature(auth._create_private_key(pem), body),
+        number=number
+    )
+    sign_only = timeit(lambda: auth._create_signature(key, body), number=number)
+
+    print(f'parse + sign per token: {parse_and_sign / number * 1000:.3f} ms')
+    print(f'sign with loaded key:   {sign_only / number * 1000:.3f} ms')
+    auth.close()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,64 @@
+"""Import time of the modules a cron script or the cli loads.
+
+    python -m benchmarks.startup [runs]
+
+Each statement runs in a fresh interpreter under `python -X importtime`,
+the reported time is the median cumulative time of the imports done by the
+statement itself, followed by the slowest imports of the last run.
+"""
+import statistics
+import subprocess
+import sys
+
+statements = {
+    'import TransIpRestfulAPI': 'import TransIpRestfulAPI',
+    'import TransIpCli': 'import TransIpCli',
+    'cli parser': 'import TransIpCli; TransIpCli.parser()',
+    'construct api': (
+        'from cryptography.hazmat.primitives.asymmetric import rsa; '
+        'key = rsa.generate_private_key(public_exponent=65537, key_size=2048); '
+        'from TransIpRestfulAPI import TransIpRestfulAPI; TransIpRestfulAPI("benchmark", key)'
+    ),
+}
+
+
+def importtime(statement: str) -> list:
+    """(module, self us, cumulative us) of every import, in import order."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.PIPE, check=True, universal_newlines=True
+    ).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        own, cumulative, module = line[len('import time:'):].split('|')
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        imports.append((module.strip(), int(own), int(cumulative), depth))
+
+    return imports
+
+
+def statement_time(imports: list) -> int:
+    """Cumulative microseconds of the imports done by the statement, site and its children are left out."""
+    site = max(i for i, (module, _, _, depth) in enumerate(imports) if module == 'site' and depth == 0)
+    return sum(cumulative for _, _, cumulative, depth in imports[site + 1:] if depth == 0)
+
+
+def main(runs: int = 5):
+    runs = int(runs)
+    for name, statement in statements.items():
+        samples = []
+        for _ in range(runs):
+            imports = importtime(statement)
+            samples.append(statement_time(imports))
+
+        site = max(i for i, (module, _, _, depth) in enumerate(imports) if module == 'site' and depth == 0)
+        slowest = sorted(imports[site + 1:], key=lambda item: item[1], reverse=True)[:5]
+        print(f'{name:24} {statistics.median(samples) / 1000:7.1f} ms')
+        print('    ' + ', '.join(f'{module} {own / 1000:.1f} ms' for module, own, _, _ in slowest))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
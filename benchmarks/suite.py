@@ -0,0 +1,95 @@
+"""Listing, hydration and dns sync workloads against the fake TransIP server.
+
+    python -m benchmarks.suite [domains] [latency_seconds]
+
+Reports requests per second, p50/p99 request latency and the peak traced
+memory and allocated blocks of a second, traced, run of each workload.
+"""
+import sys
+import tracemalloc
+
+from time import perf_counter
+
+from benchmarks.fake_server import FakeTransIpServer
+
+
+def listing(api):
+    api.get_domains()
+    sum(1 for _ in api.iter_domains(page_size=100))
+    api.get_invoices()
+    api.get_products()
+
+
+def hydration(api):
+    api.get_domains(include=['dns', 'contacts', 'nameservers', 'ssl', 'branding'], workers=16)
+
+
+def dns_sync(api):
+    domains = [domain.name for domain in api.get_domains()][:50]
+    for name in domains:
+        zone = api.get_dns_for_domain(name)
+        desired = [dns.serialize() for dns in zone.dnses[1:]]
+        desired.append({'name': '_acme-challenge', 'expire': 60, 'type': 'TXT', 'content': name})
+        zone.sync(desired)
+
+
+workloads = {'listing': listing, 'hydration': hydration, 'dns sync': dns_sync}
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+
+def run(workload, domains: int, latency: float) -> dict:
+    server = FakeTransIpServer(domains=domains, latency=latency).start()
+    try:
+        api = server.client()
+        api.auth.set_read_only(False)
+        api.test_connection()
+        samples = []
+        api.instrumentation.add_after_hook(lambda method, endpoint, status, seconds, size, error: samples.append(seconds))
+
+        requests_before = server.requests
+        start = perf_counter()
+        workload(api)
+        elapsed = perf_counter() - start
+        requests = server.requests - requests_before
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        workload(api)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+
+        api.close()
+        samples = samples[:requests]
+        return {
+            'requests': requests,
+            'seconds': elapsed,
+            'rps': requests / elapsed if elapsed else 0.0,
+            'p50': percentile(samples, 0.5),
+            'p99': percentile(samples, 0.99),
+            'peak': peak,
+            'blocks': blocks
+        }
+    finally:
+        server.stop()
+
+
+def main(domains: int = 500, latency: float = 0.005):
+    domains, latency = int(domains), float(latency)
+    print(f'{domains} domains, {latency * 1000:.1f} ms server latency')
+    for name, workload in workloads.items():
+        result = run(workload, domains, latency)
+        print(
+            f"{name:10} {result['requests']:6} req {result['seconds']:7.2f} s {result['rps']:8.1f} req/s "
+            f"p50 {result['p50'] * 1000:6.1f} ms p99 {result['p99'] * 1000:6.1f} ms "
+            f"peak {result['peak'] / 1024 / 1024:6.1f} MiB, {result['blocks']} blocks retained"
+        )
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
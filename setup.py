@@ -12,11 +12,13 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/mathijswesterhof/TransIp_Rest_api_python",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=['benchmarks']),
+    py_modules=['TransIpRestfulAPI', 'AsyncTransIpRestfulAPI', 'AccountPool', 'ChangeWatcher', 'InventorySnapshot', 'ProductCatalogue', 'TransIpCli'],
+    entry_points={'console_scripts': ['transip = TransIpCli:main']},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: GNU GPLv3 License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
 )
\ No newline at end of file
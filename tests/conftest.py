@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+
+from benchmarks.fake_server import FakeTransIpServer  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def server():
+    server = FakeTransIpServer(domains=5, dns_entries=2, invoices=3).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def api(server, private_key):
+    api = server.client(key=private_key)
+    api.auth.set_read_only(False)
+    yield api
+    api.close()
+
+
+@pytest.fixture
+def calls(server):
+    """(method, path) of every request the server handled."""
+    calls = []
+    handle = server.handle
+
+    def record(method, path, query, body):
+        calls.append((method, path))
+        return handle(method, path, query, body)
+
+    server.handle = record
+    return calls
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from HttpLogic.Exceptions import NotFoundError
+
+
+@pytest.fixture
+def async_api(server, private_key):
+    api = server.async_client(key=private_key, concurrency=4)
+    yield api
+    api.close()
+
+
+def test_get_domains_with_includes(server, async_api):
+    domains = asyncio.run(async_api.get_domains(['odd'], include=['nameservers', 'dns']))
+
+    assert [domain.name for domain in domains] == ['example-1.nl', 'example-3.nl']
+    for domain in domains:
+        assert [name_server.hostname for name_server in domain.name_servers] == ['ns0.transip.net', 'ns1.transip.net', 'ns2.transip.net']
+        assert len(domain.dnses.dnses) == 2
+
+
+def test_gather_keeps_input_order(async_api):
+    async def main():
+        return await async_api.gather(*(async_api.get_domain(f'example-{i}.nl') for i in (4, 0, 3, 1, 2)))
+
+    assert [domain.name for domain in asyncio.run(main())] == [f'example-{i}.nl' for i in (4, 0, 3, 1, 2)]
+
+
+def test_gather_return_exceptions(async_api):
+    async def main(return_exceptions: bool):
+        return await async_api.gather(
+            async_api.get_domain('example-0.nl'),
+            async_api.get_domain('missing.nl'),
+            return_exceptions=return_exceptions
+        )
+
+    domain, error = asyncio.run(main(True))
+    assert domain.name == 'example-0.nl'
+    assert isinstance(error, NotFoundError)
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(main(False))
+
+
+def test_gather_rejects_limit_above_concurrency(async_api):
+    async def main():
+        return await async_api.gather(async_api.get_domain('example-0.nl'), limit=5)
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
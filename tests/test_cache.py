@@ -0,0 +1,72 @@
+import pytest
+
+from HttpLogic.Cache import MemoryCache, ResponseCache, SqliteCache
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def cache(request, tmp_path):
+    if request.param == 'memory':
+        yield MemoryCache()
+        return
+
+    cache = SqliteCache(str(tmp_path / 'cache.db'))
+    yield cache
+    cache.close()
+
+
+def test_ttl_patterns_match_single_segments(cache):
+    assert cache.ttl('/products') == 3600
+    assert cache.ttl('/products/vps-bladevps-x1/elements') == 3600
+    assert cache.ttl('/invoices/F0000001') == 3600
+    assert cache.ttl('/invoices/F0000001?page=1#login') == 3600
+    assert cache.ttl('/invoices/F0000001/pdf') is None
+    assert cache.ttl('/domains') is None
+
+
+def test_store_and_lookup(cache):
+    cache.store('/invoices/F1#a', b'{"invoice": 1}', 'etag')
+    cache.store('/domains', b'{}')
+
+    entry = cache.lookup('/invoices/F1#a')
+    assert entry.content == b'{"invoice": 1}' and entry.etag == 'etag' and entry.fresh()
+    assert cache.lookup('/invoices/F1#b') is None
+    assert cache.lookup('/domains') is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_expired_entry_is_kept_for_revalidation(cache):
+    cache.ttls = {'/invoices/*': -1}
+    cache.store('/invoices/F1', b'{}', 'etag')
+
+    entry = cache.lookup('/invoices/F1')
+    assert entry is not None and not entry.fresh()
+    assert cache.stats()['misses'] == 1
+
+
+def test_invalidate_stops_at_segment_boundary(cache):
+    for url in ['/invoices/1#a', '/invoices/1#b', '/invoices/1/items#a', '/invoices/10#a']:
+        cache.store(url, b'{}')
+
+    cache.invalidate('/invoices/1')
+
+    assert cache.lookup('/invoices/1#a') is None
+    assert cache.lookup('/invoices/1#b') is None
+    assert cache.lookup('/invoices/1/items#a') is None
+    assert cache.lookup('/invoices/10#a') is not None
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_bytes=10)
+    cache.store('/products', b'12345')
+    cache.store('/invoices/1', b'12345')
+    cache.lookup('/products')
+    cache.store('/invoices/2', b'12345')
+
+    assert cache.lookup('/invoices/1') is None
+    assert cache.lookup('/products') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_response_cache_is_abstract():
+    with pytest.raises(TypeError):
+        ResponseCache()
@@ -0,0 +1,33 @@
+from ChangeWatcher import ChangeWatcher, WatchEvent
+
+
+def _record(name: str, content: str) -> dict:
+    return {'name': name, 'expire': 300, 'type': 'A', 'content': content}
+
+
+def test_dns_changes_are_reported(server, api):
+    server.dns['example-0.nl'] = [_record('www', '1.1.1.1'), _record('www', '2.2.2.2'), _record('mail', '5.5.5.5')]
+    watcher = ChangeWatcher(api, resources=('dns',), min_interval=0.0, max_interval=0.0)
+    assert watcher.poll() == []
+
+    server.dns['example-0.nl'] = [_record('www', '1.1.1.1'), _record('www', '3.3.3.3'), _record('mail', '6.6.6.6')]
+    events = [(event.kind, event.old and event.old.content, event.new and event.new.content)
+              for event in watcher.poll() if event.domain == 'example-0.nl']
+
+    # www is not unique in the zone, so its change is a remove and an add
+    assert sorted(events, key=str) == sorted([
+        (WatchEvent.changed, '5.5.5.5', '6.6.6.6'),
+        (WatchEvent.removed, '2.2.2.2', None),
+        (WatchEvent.added, None, '3.3.3.3'),
+    ], key=str)
+
+
+def test_domains_added_and_removed(server, api):
+    watcher = ChangeWatcher(api, resources=(), listing_interval=0.0)
+    watcher.poll()
+
+    server.domains['new.nl'] = dict(server.domains['example-0.nl'], name='new.nl')
+    del server.domains['example-1.nl']
+    events = {(event.kind, event.domain) for event in watcher.poll()}
+
+    assert events == {(WatchEvent.added, 'new.nl'), (WatchEvent.removed, 'example-1.nl')}
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+import TransIpCli
+
+
+@pytest.fixture
+def cli(server, private_key, monkeypatch):
+    def api(arguments, read_only: bool = True):
+        client = server.client(key=private_key)
+        client.auth.set_read_only(read_only)
+        return client
+
+    monkeypatch.setattr(TransIpCli, '_api', api)
+
+
+@pytest.fixture
+def records(server, tmp_path):
+    records = [dict(record) for record in server.dns['example-0.nl']]
+    records[0]['content'] = '10.9.9.9'
+    records.append({'name': 'mail', 'expire': 300, 'type': 'mx', 'content': '10 mail.example.nl.'})
+    path = tmp_path / 'records.json'
+    path.write_text(json.dumps({'dnsEntries': records}))
+    return str(path)
+
+
+def test_dns_sync_dry_run_sends_no_writes(cli, server, calls, records, capsys):
+    before = [dict(record) for record in server.dns['example-0.nl']]
+
+    assert TransIpCli.main(['dns', 'sync', 'example-0.nl', records, '--dry-run']) == 0
+
+    assert capsys.readouterr().out.splitlines() == [
+        '+ mail 300 MX 10 mail.example.nl.',
+        '~ www0 86400 A 10.0.0.0 -> 10.9.9.9',
+        '1 unchanged, method: put'
+    ]
+    assert [call for call in calls if call != ('POST', '/v6/auth')] == [('GET', '/v6/domains/example-0.nl/dns')]
+    assert server.dns['example-0.nl'] == before
+
+
+def test_dns_sync_prints_the_applied_changes(cli, server, records, capsys):
+    assert TransIpCli.main(['dns', 'sync', 'example-0.nl', records, '--strategy', 'incremental']) == 0
+
+    assert capsys.readouterr().out.splitlines() == [
+        '+ mail 300 MX 10 mail.example.nl.',
+        '~ www0 86400 A 10.0.0.0 -> 10.9.9.9',
+        '1 unchanged, method: incremental'
+    ]
+    assert server.dns['example-0.nl'][0]['content'] == '10.9.9.9'
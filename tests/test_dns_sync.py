@@ -0,0 +1,65 @@
+from Models.DNSes import DNSes
+
+
+def _record(name: str, content: str, dtype: str = 'A', expire: int = 300) -> dict:
+    return {'name': name, 'expire': expire, 'type': dtype, 'content': content}
+
+
+def _contents(server, domain: str) -> list:
+    return sorted(entry['content'] for entry in server.dns[domain])
+
+
+def test_sync_unchanged_zone_sends_nothing(server, api):
+    server.dns['example-0.nl'] = [_record('www', '1.1.1.1')]
+    zone = api.get_dns_for_domain('example-0.nl')
+    requests = server.requests
+
+    report = zone.sync([_record('www', '1.1.1.1')])
+
+    assert report['method'] is None
+    assert report['unchanged'] == 1
+    assert server.requests == requests
+
+
+def test_sync_patches_content_of_unique_slot(server, api):
+    server.dns['example-0.nl'] = [_record('www', '1.1.1.1'), _record('mail', '5.5.5.5')]
+    zone = api.get_dns_for_domain('example-0.nl')
+
+    report = zone.sync([_record('www', '2.2.2.2'), _record('mail', '5.5.5.5')], 'incremental')
+
+    assert [(old.content, new.content) for old, new in report['updated']] == [('1.1.1.1', '2.2.2.2')]
+    assert report['added'] == [] and report['removed'] == []
+    assert _contents(server, 'example-0.nl') == ['2.2.2.2', '5.5.5.5']
+
+
+def test_sync_does_not_patch_slot_shared_with_unchanged_record(server, api):
+    server.dns['example-0.nl'] = [_record('www', '1.1.1.1'), _record('www', '2.2.2.2')]
+    zone = api.get_dns_for_domain('example-0.nl')
+
+    report = zone.sync([_record('www', '1.1.1.1'), _record('www', '3.3.3.3')], 'incremental')
+
+    assert report['updated'] == []
+    assert [dns.content for dns in report['removed']] == ['2.2.2.2']
+    assert [dns.content for dns in report['added']] == ['3.3.3.3']
+    assert _contents(server, 'example-0.nl') == ['1.1.1.1', '3.3.3.3']
+
+
+def test_sync_put_replaces_zone(server, api):
+    server.dns['example-0.nl'] = [_record('www', '1.1.1.1'), _record('old', '9.9.9.9')]
+    zone = api.get_dns_for_domain('example-0.nl')
+    desired = [_record('www', '1.1.1.1'), _record('@', 'v=spf1', 'TXT', 60), _record('new', '4.4.4.4')]
+
+    report = zone.sync(desired)
+
+    assert report['method'] == 'put'
+    assert _contents(server, 'example-0.nl') == ['1.1.1.1', '4.4.4.4', 'v=spf1']
+
+
+def test_diff_duplicate_records_are_counted():
+    removed, added, updated, unchanged = DNSes.diff(
+        [('www', 300, 'A', '1.1.1.1'), ('www', 300, 'A', '1.1.1.1')],
+        [('www', 300, 'A', '1.1.1.1')]
+    )
+
+    assert list(removed.elements()) == [('www', 300, 'A', '1.1.1.1')]
+    assert not added and updated == [] and unchanged == 1
@@ -0,0 +1,45 @@
+from Models import Contacts, DNSes, NameServers
+
+contact = {
+    'type': 'registrant', 'firstName': 'Jan', 'lastName': 'Jansen', 'companyName': '', 'companyKvk': '',
+    'companyType': '', 'street': 'Straat', 'number': '1', 'postalCode': '1234AB', 'city': 'Amsterdam',
+    'phoneNumber': '+31201234567', 'faxNumber': '', 'email': 'jan@example.nl', 'country': 'nl'
+}
+name_server = {'hostname': 'ns0.example.nl', 'ipv4': '', 'ipv6': ''}
+record = {'name': '@', 'expire': 300, 'type': 'A', 'content': '1.2.3.4'}
+
+
+def test_create_domain_serializes_models(server, api):
+    domain = api.create_domain(
+        'models.nl',
+        Contacts(api.requests, [contact], 'models.nl'),
+        [NameServers(api.requests, name_server)],
+        DNSes(api.requests, [record], 'models.nl')
+    )
+
+    assert domain.name == 'models.nl'
+    assert server.dns['models.nl'] == [record]
+
+
+def test_transfer_domains_reports_per_domain(server, api):
+    api.test_connection()
+    requests = server.requests
+    reports = api.transfer_domains([
+        {'domain_name': 'a.nl', 'transfer_code': 'code', 'dnses': DNSes(api.requests, [record], 'a.nl')},
+        {'domain_name': 'b.nl', 'contacts': Contacts(api.requests, [contact], 'b.nl')},
+        {'domain_name': 'c.nl', 'name_servers': [NameServers(api.requests, name_server)]},
+    ])
+
+    assert [(report['domain'], report['success'], report['error']) for report in reports] == [
+        ('a.nl', True, None), ('b.nl', True, None), ('c.nl', True, None)
+    ]
+    assert [report['result'].name for report in reports] == ['a.nl', 'b.nl', 'c.nl']
+    # three posts and a single listing
+    assert server.requests - requests == 4
+
+
+def test_create_domains_accepts_names(server, api):
+    reports = api.create_domains(['x.nl', 'y.nl'])
+
+    assert all(report['success'] for report in reports)
+    assert {'x.nl', 'y.nl'} <= set(server.domains)
@@ -0,0 +1,42 @@
+from InventorySnapshot import InventorySnapshot
+
+
+def test_domains_carry_only_their_own_tags(server, api, tmp_path):
+    server.domains['example-0.nl']['tags'] = ['even', 'customer']
+    snapshot = InventorySnapshot(api, str(tmp_path / 'snapshot.db'))
+    try:
+        snapshot.refresh()
+
+        assert {domain.name: domain.tags for domain in snapshot.get_domains('odd')} == {
+            'example-1.nl': ['odd'], 'example-3.nl': ['odd']
+        }
+        assert snapshot.get_domains('customer')[0].tags == ['even', 'customer']
+    finally:
+        snapshot.close()
+
+
+def test_failing_domain_keeps_its_rows(server, api, tmp_path):
+    snapshot = InventorySnapshot(api, str(tmp_path / 'snapshot.db'))
+    try:
+        snapshot.refresh()
+        fetched_at = snapshot._query('SELECT fetched_at FROM domains WHERE name = ?', ('example-1.nl',))
+        server.dns['example-1.nl'].append({'name': 'new', 'expire': 300, 'type': 'A', 'content': '10.1.1.1'})
+        server.domains['example-5.nl'] = dict(server.domains['example-1.nl'], name='example-5.nl')
+        handle = server.handle
+
+        def failing_handle(method, path, query, body):
+            if path in ('/v6/domains/example-1.nl/ssl', '/v6/domains/example-5.nl/dns'):
+                return 404, {'error': 'Not found'}
+            return handle(method, path, query, body)
+
+        server.handle = failing_handle
+        report = snapshot.refresh(force=True)
+
+        assert sorted(report['failed']) == ['example-1.nl', 'example-5.nl']
+        assert report['added'] == []
+        assert sorted(report['refreshed']) == ['example-0.nl', 'example-2.nl', 'example-3.nl', 'example-4.nl']
+        assert snapshot.get_dns_with_content('10.1.1.1') == []
+        assert snapshot._query('SELECT fetched_at FROM domains WHERE name = ?', ('example-1.nl',)) == fetched_at
+        assert 'example-5.nl' not in [domain.name for domain in snapshot.get_domains()]
+    finally:
+        snapshot.close()
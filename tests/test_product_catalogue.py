@@ -0,0 +1,23 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ProductCatalogue import ProductCatalogue
+
+
+def test_concurrent_first_lookups_load_once(server, api, calls):
+    api.auth.get_token()
+    server.latency = 0.05
+    catalogue = ProductCatalogue(api, background=False)
+    barrier = threading.Barrier(8)
+
+    def lookup(_):
+        barrier.wait()
+        return catalogue.get('vps-bladevps-x1').name
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(lookup, range(8))) == ['vps-bladevps-x1'] * 8
+
+    assert calls.count(('GET', '/v6/products')) == 1
+    assert len([call for call in calls if call[0] == 'GET']) == 1 + len(catalogue.names())
+    assert api.get_single_flight_stats()['coalesced'] == 0
@@ -0,0 +1,21 @@
+from HttpLogic.RequestTypes import ApiRequests
+
+
+def test_build_query_joins_lists():
+    assert ApiRequests.build_query({'tags': ['odd', 'even'], 'include': ('nameservers',)}) == \
+        '?tags=odd,even&include=nameservers'
+
+
+def test_build_query_leaves_out_empty_values():
+    assert ApiRequests.build_query({'tags': None, 'include': [], 'page': '', 'fields': set()}) == ''
+    assert ApiRequests.build_query({'tags': None, 'page': 2, 'pageSize': 100}) == '?page=2&pageSize=100'
+
+
+def test_build_query_encodes_values():
+    assert ApiRequests.build_query({'tags': ['a b', 'c&d', 'e=f/g']}) == '?tags=a+b,c%26d,e%3Df%2Fg'
+
+
+def test_get_domains_by_tag(api):
+    assert [domain.name for domain in api.get_domains(['odd'])] == ['example-1.nl', 'example-3.nl']
+    assert [domain.name for domain in api.get_domains(['odd', 'even'])] == [f'example-{i}.nl' for i in range(5)]
+    assert [domain.tags for domain in api.get_domains(['even'])] == [['even']] * 3
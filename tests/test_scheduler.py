@@ -0,0 +1,96 @@
+from time import monotonic
+
+import pytest
+
+from HttpLogic.Exceptions import RateLimitError
+from HttpLogic.Session import ConnectionPool
+from benchmarks.fake_server import FakeTransIpServer
+
+
+def _fail(server, path: str, status: int, times: int = None) -> list:
+    """Answer path with status, the first `times` requests or all of them, return the requests made to path."""
+    calls = []
+    handle = server.handle
+
+    def failing(method, request_path, query, body):
+        if request_path == path:
+            calls.append(method)
+            if times is None or len(calls) <= times:
+                return status, {'error': 'Injected failure'}
+
+        return handle(method, request_path, query, body)
+
+    server.handle = failing
+    return calls
+
+
+@pytest.fixture
+def throttled(server, private_key):
+    api = server.client(key=private_key, throttle=True)
+    api.auth.set_read_only(False)
+    api.requests.scheduler.backoff = 0.001
+    yield api
+    api.close()
+
+
+def test_waits_for_reset_when_no_requests_remain(private_key):
+    server = FakeTransIpServer(domains=1, rate_limit=3, rate_limit_window=1.0).start()
+    api = server.client(key=private_key, throttle=True)
+    try:
+        api.auth.get_token()
+        assert api.test_connection()
+        assert api.test_connection()
+
+        start = monotonic()
+        assert api.test_connection()
+        stats = api.get_scheduler_stats()
+
+        assert monotonic() - start > 0.05
+        assert stats['throttled_seconds'] > 0.05
+        assert stats['rate_limited'] == 0
+    finally:
+        api.close()
+        server.stop()
+
+
+def test_get_is_retried_on_server_errors(server, throttled):
+    calls = _fail(server, '/v6/domains/example-0.nl', 503, times=2)
+
+    assert throttled.get_domain('example-0.nl').name == 'example-0.nl'
+    assert calls == ['GET'] * 3
+    assert throttled.get_scheduler_stats()['retries'] == 2
+
+
+def test_post_is_not_retried_on_server_errors(server, throttled):
+    calls = _fail(server, '/v6/domains/example-0.nl/dns', 500, times=1)
+
+    with pytest.raises(ConnectionError):
+        throttled.create_dns_entry_for_domain('example-0.nl', 'www', 300, 'A', '10.0.0.1')
+
+    assert calls == ['POST']
+    assert throttled.get_scheduler_stats()['retries'] == 0
+
+
+def test_rate_limit_error_after_max_retries(server, throttled):
+    calls = _fail(server, '/v6/domains/example-0.nl', 429)
+    throttled.requests.scheduler.max_retries = 2
+
+    with pytest.raises(RateLimitError):
+        throttled.get_domain('example-0.nl')
+
+    assert calls == ['GET'] * 3
+    assert throttled.get_scheduler_stats()['rate_limited'] == 3
+
+
+def test_retried_stream_gives_its_connection_back(server, private_key):
+    api = server.client(key=private_key, throttle=True, session=ConnectionPool(pool_maxsize=2))
+    api.requests.scheduler.backoff = 0.001
+    _fail(server, '/v6/invoices/F0000000/pdf', 500, times=2)
+    try:
+        chunks = []
+        api.requests.perform_stream_request('/invoices/F0000000/pdf', chunks.append)
+
+        assert b''.join(chunks).startswith(b'{"pdf": "')
+        assert api.get_connection_stats()['connections_opened'] == 1
+    finally:
+        api.close()
@@ -0,0 +1,61 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+import pytest
+
+from HttpLogic.Exceptions import NotFoundError
+
+
+def _concurrently(func, times: int) -> list:
+    """Call func from `times` threads released at once, return results or exceptions in order."""
+    barrier = threading.Barrier(times)
+
+    def call(_):
+        barrier.wait()
+        try:
+            return func()
+        except Exception as error:
+            return error
+
+    with ThreadPoolExecutor(max_workers=times) as executor:
+        return list(executor.map(call, range(times)))
+
+
+@pytest.fixture
+def slow(server, api):
+    api.auth.get_token()
+    server.latency = 0.2
+    return server
+
+
+def test_identical_gets_share_one_request(slow, api, calls):
+    results = _concurrently(lambda: api.requests.perform_get_request('/domains/example-0.nl', lambda json: json), 6)
+
+    assert all(result['domain']['name'] == 'example-0.nl' for result in results)
+    assert calls == [('GET', '/v6/domains/example-0.nl')]
+    assert api.get_single_flight_stats() == {'calls': 1, 'coalesced': 5}
+
+
+def test_error_reaches_every_waiter(slow, api, calls):
+    results = _concurrently(lambda: api.get_domain('missing.nl'), 4)
+
+    assert all(isinstance(result, NotFoundError) for result in results)
+    assert calls == [('GET', '/v6/domains/missing.nl')]
+
+
+def test_token_scopes_are_not_coalesced(slow, api, calls):
+    api.auth.set_read_only(True)
+    api.auth.get_token()
+    api.auth.set_read_only(False)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        read_write = executor.submit(api.get_domain, 'example-0.nl')
+        sleep(0.05)
+        api.auth.set_read_only(True)
+        read_only = executor.submit(api.get_domain, 'example-0.nl')
+        read_write.result()
+        read_only.result()
+
+    assert calls.count(('GET', '/v6/domains/example-0.nl')) == 2
+    assert api.get_single_flight_stats()['coalesced'] == 0
@@ -0,0 +1,44 @@
+from datetime import date, timedelta
+
+from benchmarks.fake_server import FakeTransIpServer
+
+
+def _expire(server, name: str, days: int):
+    server.domains[name]['renewalDate'] = (date.today() + timedelta(days=days)).isoformat()
+
+
+def test_scan_sorts_and_skips_failing_domains(server, api):
+    for i, days in enumerate([40, 10, -3, 5, 2000]):
+        _expire(server, f'example-{i}.nl', days)
+
+    handle = server.handle
+
+    def failing_handle(method, path, query, body):
+        if path.endswith('/example-3.nl/ssl'):
+            return 404, {'error': 'Not found'}
+        return handle(method, path, query, body)
+
+    server.handle = failing_handle
+    errors = []
+    results = list(api.scan_ssl_expiry(within_days=60, on_error=lambda name, error: errors.append(name)))
+
+    assert [name for name, _ in results] == ['example-2.nl', 'example-1.nl', 'example-0.nl']
+    assert errors == ['example-3.nl']
+
+
+def test_scan_yields_expired_certificates_before_the_scan_finishes(private_key):
+    server = FakeTransIpServer(domains=40, latency=0.005).start()
+    try:
+        _expire(server, 'example-0.nl', -1)
+        api = server.client(key=private_key)
+        scan = api.scan_ssl_expiry(workers=1)
+
+        name, ssl = next(scan)
+        requests = server.requests
+
+        assert name == 'example-0.nl' and ssl.expiration_date < date.today()
+        assert requests < 40
+        scan.close()
+        api.close()
+    finally:
+        server.stop()
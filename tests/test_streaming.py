@@ -0,0 +1,56 @@
+import base64
+import hashlib
+import io
+import json
+
+import pytest
+
+from HttpLogic.Streaming import Base64FieldWriter
+
+CONTENT = bytes(range(256)) * 3 + b'end'
+
+
+def _body() -> bytes:
+    # json.dumps does not escape slashes, the api does
+    encoded = base64.b64encode(CONTENT).decode('ascii').replace('/', '\\/')
+    return ('{"invoice": {"number": "F0001", "pdf": "' + encoded + '", "pages": 2}}').encode('utf-8')
+
+
+def _write(chunks: list) -> Base64FieldWriter:
+    writer = Base64FieldWriter('pdf', io.BytesIO())
+    for chunk in chunks:
+        writer.feed(chunk)
+
+    writer.close()
+    return writer
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 7, 64, 4096])
+def test_decodes_field_split_over_chunks(size):
+    body = _body()
+    writer = _write([body[start:start + size] for start in range(0, len(body), size)])
+
+    assert writer.file.getvalue() == CONTENT
+    assert writer.size == len(CONTENT)
+    assert writer.sha256.hexdigest() == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_every_split_point():
+    body = _body()
+    for split in range(len(body)):
+        assert _write([body[:split], body[split:]]).file.getvalue() == CONTENT
+
+
+def test_ignores_other_fields():
+    body = json.dumps({'pdfName': 'invoice.pdf', 'pdf': base64.b64encode(b'pdf').decode('ascii')}).encode('utf-8')
+
+    assert _write([body]).file.getvalue() == b'pdf'
+
+
+def test_truncated_body_raises():
+    body = _body()
+    writer = Base64FieldWriter('pdf', io.BytesIO())
+    writer.feed(body[:len(body) // 2])
+
+    with pytest.raises(ValueError):
+        writer.close()
@@ -0,0 +1,88 @@
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+import pytest
+
+from HttpLogic.TokenManager import TokenManager
+
+
+class FastTimer(threading.Timer):
+    """Timer running a hundred times faster, a refresh due after 45 seconds runs after 0.45."""
+
+    def __init__(self, interval, function, args=None, kwargs=None):
+        super().__init__(interval / 100, function, args, kwargs)
+
+
+class Fetch:
+    def __init__(self, lifetime: float = 60.0, delay: float = 0.0):
+        self.lifetime = lifetime
+        self.delay = delay
+        self.scopes = []
+        self._lock = threading.Lock()
+
+    def __call__(self, scope) -> tuple:
+        with self._lock:
+            self.scopes.append(scope)
+            token = f'token-{len(self.scopes)}'
+
+        sleep(self.delay)
+        return token, self.lifetime
+
+
+@pytest.fixture
+def fast_timers(monkeypatch):
+    monkeypatch.setattr(threading, 'Timer', FastTimer)
+
+
+def test_concurrent_gets_share_one_fetch():
+    fetch = Fetch(delay=0.05)
+    manager = TokenManager(fetch)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(lambda _: manager.get('scope'), range(8)))
+    finally:
+        manager.close()
+
+    assert tokens == ['token-1'] * 8
+    assert fetch.scopes == ['scope']
+
+
+def test_used_token_is_refreshed_before_it_expires(fast_timers):
+    fetch = Fetch()
+    manager = TokenManager(fetch, refresh_margin=15.0)
+    try:
+        manager.get('scope')
+        manager.get('scope')
+        sleep(0.7)
+
+        assert fetch.scopes == ['scope', 'scope']
+        assert manager.peek('scope') == 'token-2'
+        assert manager.get('scope') == 'token-2'
+    finally:
+        manager.close()
+
+
+def test_unused_token_is_not_refreshed(fast_timers):
+    fetch = Fetch()
+    manager = TokenManager(fetch, refresh_margin=15.0)
+    try:
+        manager.get('scope')
+        sleep(0.7)
+
+        assert fetch.scopes == ['scope']
+        assert manager._timers == {}
+        assert manager.get('scope') == 'token-1'
+    finally:
+        manager.close()
+
+
+def test_scopes_keep_their_cached_token(api, calls):
+    tokens = []
+    for read_only in (True, False, True, False):
+        api.auth.set_read_only(read_only)
+        tokens.append(api.auth.get_token())
+
+    assert tokens[0] == tokens[2] and tokens[1] == tokens[3]
+    assert calls.count(('POST', '/v6/auth')) == 2
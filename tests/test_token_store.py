@@ -0,0 +1,121 @@
+import os
+import stat
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep, time
+
+import pytest
+
+from HttpLogic.TokenStore import FileTokenStore, SqliteTokenStore, TokenStore
+
+
+@pytest.fixture(params=['file', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'file':
+        yield FileTokenStore(str(tmp_path / 'tokens'))
+    else:
+        store = SqliteTokenStore(str(tmp_path / 'tokens.db'))
+        yield store
+        store.close()
+
+
+class Fetch:
+    def __init__(self, lifetime: float = 1800.0, delay: float = 0.0):
+        self.lifetime = lifetime
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> tuple:
+        with self._lock:
+            self.calls += 1
+            token = f'token-{self.calls}'
+
+        sleep(self.delay)
+        return token, self.lifetime
+
+
+def test_reuses_stored_token(store):
+    fetch = Fetch()
+
+    assert store.get('login', fetch)[0] == 'token-1'
+    token, lifetime = store.get('login', fetch)
+    assert token == 'token-1' and 0 < lifetime <= 1800
+    assert fetch.calls == 1
+
+
+def test_tokens_are_stored_per_key(store):
+    fetch = Fetch()
+
+    assert store.get('login:read-only', fetch)[0] == 'token-1'
+    assert store.get('login:read-write', fetch)[0] == 'token-2'
+    assert store.get('login:read-only', fetch)[0] == 'token-1'
+
+
+def test_refreshes_token_expiring_within_min_lifetime(store):
+    fetch = Fetch(lifetime=60.0)
+    store.get('login', fetch)
+
+    assert store.get('login', fetch, min_lifetime=30.0)[0] == 'token-1'
+    assert store.get('login', fetch, min_lifetime=120.0)[0] == 'token-2'
+
+
+def test_delete(store):
+    fetch = Fetch()
+    store.get('login', fetch)
+    store.delete('login')
+    store.delete('unknown')
+
+    assert store.get('login', fetch)[0] == 'token-2'
+
+
+def test_concurrent_gets_fetch_once(store):
+    fetch = Fetch(delay=0.05)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tokens = list(executor.map(lambda _: store.get('login', fetch)[0], range(8)))
+
+    assert tokens == ['token-1'] * 8
+    assert fetch.calls == 1
+
+
+def test_file_store_is_private(tmp_path):
+    store = FileTokenStore(str(tmp_path / 'tokens'))
+    store.get('login', Fetch())
+
+    for name in os.listdir(store.directory):
+        assert stat.S_IMODE(os.stat(os.path.join(store.directory, name)).st_mode) & 0o077 == 0
+
+
+def test_token_store_is_abstract():
+    with pytest.raises(TypeError):
+        TokenStore()
+
+
+@pytest.mark.parametrize('expiration_time, refresh_margin', [('1 minutes', 60.0), ('5 minutes', 300.0)])
+def test_clients_share_short_lived_tokens(server, calls, private_key, tmp_path, expiration_time, refresh_margin):
+    store = FileTokenStore(str(tmp_path / 'tokens'))
+    clients = [server.client(key=private_key, token_store=store) for _ in range(5)]
+    try:
+        for client in clients:
+            client.auth.set_time(expiration_time)
+            client.auth.set_refresh_margin(refresh_margin)
+            assert client.test_connection()
+    finally:
+        for client in clients:
+            client.close()
+
+    assert calls.count(('POST', '/v6/auth')) == 1
+
+
+def test_client_reuses_token_in_second_half_of_its_life(server, calls, private_key, tmp_path):
+    store = FileTokenStore(str(tmp_path / 'tokens'))
+    client = server.client(key=private_key, token_store=store)
+    client.auth.set_time('2 minutes')
+    store._write(client.auth.token_key(client.auth.scope()), 'stored', time() + 50)
+    try:
+        assert client.auth.get_token() == 'stored'
+    finally:
+        client.close()
+
+    assert ('POST', '/v6/auth') not in calls